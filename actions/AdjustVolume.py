@@ -3,27 +3,26 @@ import os
 import gi
 from gi.repository import Adw
 
-from GtkHelper.GtkHelper import ScaleRow
 from ..actions.DeviceBase import DeviceBase
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
-from loguru import logger as log
 
-from ..internal.PulseHelpers import get_device, set_volume, change_volume, get_volumes_from_device, get_standard_device
+from ..internal.PulseHelpers import change_volume
 
 
 class AdjustVolume(DeviceBase):
+    ASSET_KEYS: tuple[str, ...] = ("vol-up", "vol-down")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.plugin_base.connect_to_event(event_id="com_kawaiishay_AudioControl::PulseEvent",
-                                          callback=self.on_pulse_device_change)
-
         self.volume_adjust: int = 1
         self.volume_bounds: int = 100
 
     def build_ui(self, ui: Adw.PreferencesGroup = None) -> Adw.PreferencesGroup:
+        from ..internal.ConfigWidgets import ScaleRow
+
         self.ui = super().build_ui()
 
         self.volume_adjust_scale = ScaleRow(title=self.translate("adjust-vol-scale"), value=0, min=-50, max=50, step=1, text_left="-50", text_right="50")
@@ -77,40 +76,24 @@ class AdjustVolume(DeviceBase):
             pass
 
     def on_volume_adjust_changed(self, *args, **kwargs):
-        settings = self.get_settings()
-
         self.volume_adjust = self.volume_adjust_scale.scale.get_value()
 
         self.display_info()
         self.display_icon()
 
-        settings["volume-adjust"] = self.volume_adjust
-        self.set_settings(settings)
+        self.set_setting_deferred("volume-adjust", self.volume_adjust)
 
     def on_volume_bounds_changed(self, *args, **kwargs):
-        settings = self.get_settings()
-
         self.volume_bounds = self.volume_bound_scale.scale.get_value()
 
-        settings["volume-bounds"] = self.volume_bounds
-        self.set_settings(settings)
+        self.set_setting_deferred("volume-bounds", self.volume_bounds)
 
     def on_key_down(self):
         if None in (self.pulse_device_name, self.volume_adjust):
             self.show_error(1)
             return
 
-        try:
-            if self.use_standard:
-                device = get_standard_device(self.device_filter)
-            else:
-                device = get_device(self.device_filter, self.pulse_device_name)
-
-            change_volume(device, self.volume_adjust)
-    
-        except Exception as e:
-            log.error(e)
-            self.show_error(1)
+        self.submit_command(change_volume, self.volume_adjust, int(self.volume_bounds))
 
     async def on_pulse_device_change(self, *args, **kwargs):
         if len(args) < 2:
@@ -118,9 +101,8 @@ class AdjustVolume(DeviceBase):
 
         self.display_info()
 
-    async def on_asset_manager_change(self, *args):
-        if args[1] == "vol-down" or args[1] == "vol-up":
-            self.display_icon()
+    def on_asset_manager_change(self, *args):
+        self.display_icon()
 
     #
     # DISPLAY
@@ -134,10 +116,6 @@ class AdjustVolume(DeviceBase):
             return
 
         if self.volume_adjust >= 0:
-            result = self.plugin_base.asset_manager.icons.get_asset_values("vol-up")
+            self.display_icon_asset("vol-up")
         else:
-            result = self.plugin_base.asset_manager.icons.get_asset_values("vol-down")
-
-        if result:
-            _, render = result
-            self.set_media(render)
+            self.display_icon_asset("vol-down")
@@ -8,42 +8,25 @@ from src.backend.PluginManager.ActionBase import ActionBase
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
-from gi.repository import Adw, GObject, Gtk
+from gi.repository import Adw, Gtk, GLib
 
 from loguru import logger as log
 
-from ..internal.PulseHelpers import get_device_list, filter_proplist, DeviceFilter, get_device, get_volumes_from_device, get_standard_device
+from ..internal.SettingsWriteBehind import SettingsWriteBehind, SettingValue
+from ..internal.PulseHelpers import filter_proplist, DeviceFilter, get_device, get_volumes_from_device, \
+    get_standard_device, get_device_by_display_name, get_first_device, get_standard_device_name
 
-from GtkHelper.SearchComboRow import SearchComboRow, SearchComboRowItem
-from ..internal.AdwGrid import AdwGrid
-from ..internal.AssetManager.AssetManagerWindow import Window
 
 class InfoContent(enum.StrEnum):
     VOLUME = "volume",
     ADJUSTMENT = "adjustment",
 
 
-class DeviceFilterItem(SearchComboRowItem):
-    def __init__(self, display_label, filter: DeviceFilter):
-        super().__init__(display_label)
-        self._pulse_filter = filter
-
-    @GObject.Property
-    def pulse_filter(self):
-        return self._pulse_filter
-
-
-class InfoContentItem(SearchComboRowItem):
-    def __init__(self, display_label, info_content: InfoContent):
-        super().__init__(display_label)
-        self._info_content = info_content
-
-    @GObject.Property
-    def info_content(self):
-        return self._info_content
-
 
 class DeviceBase(ActionBase):
+    # Icons of the asset manager this action shows, it only gets notified about changes to these
+    ASSET_KEYS: tuple[str, ...] = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.has_configuration = True
@@ -52,6 +35,10 @@ class DeviceBase(ActionBase):
         self.pulse_device_name: str = ""  # Actual name of the Pulse Device
         self.device_index: int = None  # Index of the Device
         self.asset_manager_window = None
+        self.config_ui = None  # Configuration area currently open, listeners are only registered while it exists
+        self.config_closed_handler: int = None
+        # Slider changes are kept here and written once the user stops dragging
+        self.settings_write_behind = SettingsWriteBehind(super().get_settings, super().set_settings)
 
         # Settings
         # Device Selection
@@ -67,7 +54,8 @@ class DeviceBase(ActionBase):
         self.show_device_name: bool = False  # If you should show the device name
         self.device_nick: str = None  # A nick for any given device
 
-        self.plugin_base.asset_manager.icons.add_listener(self.on_asset_manager_change)
+        if self.ASSET_KEYS:
+            self.plugin_base.asset_manager.icons.add_listener(self.on_asset_manager_change, keys=set(self.ASSET_KEYS))
 
     #
     # UI
@@ -78,9 +66,20 @@ class DeviceBase(ActionBase):
         self.load_ui_settings()
         self.connect_events()
 
+        # Reopening without the previous area getting unrealized must not register everything twice
+        if self.config_ui is not None:
+            self.on_config_closed()
+
+        self.plugin_base.device_list_model.add_listener(self.on_device_list_changed)
+        # Closing the configuration must not lose changes still waiting for the idle period
+        self.config_ui = self.ui
+        self.config_closed_handler = self.ui.connect("unrealize", self.on_config_closed)
+
         return self.ui
 
     def build_ui(self, ui: Adw.PreferencesGroup = None) -> Adw.PreferencesGroup:
+        from ..internal.ConfigWidgets import SearchComboRow, AdwGrid
+
         self.ui = ui or Adw.PreferencesGroup()
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=20)
         settings_group = Adw.PreferencesGroup()
@@ -129,6 +128,32 @@ class DeviceBase(ActionBase):
     # SETTINGS
     #
 
+    def get_settings(self) -> dict:
+        settings = super().get_settings()
+
+        # Changes not written yet win over the stored ones
+        write_behind = getattr(self, "settings_write_behind", None)
+        if write_behind is not None:
+            settings.update(write_behind.get_pending())
+        return settings
+
+    def set_settings(self, settings: dict):
+        super().set_settings(settings)
+
+        # Handlers write what get_settings returned, the pending values it merged in are saved now
+        write_behind = getattr(self, "settings_write_behind", None)
+        if write_behind is not None:
+            write_behind.mark_written(settings)
+
+    def set_setting_deferred(self, key: str, value: SettingValue):
+        """
+        For settings changed by sliders, many changes in a row end up as one settings write
+        """
+        self.settings_write_behind.set(key, value)
+
+    def flush_settings(self):
+        self.settings_write_behind.flush()
+
     def load_settings(self):
         settings = self.get_settings()
 
@@ -151,19 +176,14 @@ class DeviceBase(ActionBase):
         elif self.pulse_device_name:
             device = get_device(self.device_filter, self.pulse_device_name)
         else:
-            for audio_device in get_device_list(self.device_filter):
-                if audio_device.description.__contains__("Monitor"):
-                    continue
-
-                device = audio_device
-                break
+            device = get_first_device(self.device_filter)
 
-        if not device:
-            return
+        if device:
+            self.device_index = device.index
+            self.device_name = filter_proplist(device.proplist)
+            self.pulse_device_name = device.name
 
-        self.device_index = device.index
-        self.device_name = filter_proplist(device.proplist)
-        self.pulse_device_name = device.name
+        self.update_event_subscription()
 
     def load_ui_settings(self):
         self.disconnect_events()
@@ -181,6 +201,8 @@ class DeviceBase(ActionBase):
         self.connect_events()
 
     def load_device_filter(self):
+        from ..internal.ConfigWidgets import DeviceFilterItem
+
         items = [
             DeviceFilterItem("Sink", DeviceFilter.SINK),
             DeviceFilterItem("Source", DeviceFilter.SOURCE)
@@ -194,26 +216,18 @@ class DeviceBase(ActionBase):
                 break
 
     def load_device(self):
-        device_list = []
-
-        for device in get_device_list(self.device_filter):
-            if device.description.__contains__("Monitor"):
-                continue
-
-            device_name = filter_proplist(device.proplist)
-
-            if device_name is not None:
-                device_list.append(SearchComboRowItem(display_label=device_name))
+        device_list = self.plugin_base.device_list_model.get_items(self.device_filter)
 
         self.device_dropdown.populate(device_list)
 
-
         for i in range(len(device_list)):
             if device_list[i].display_label == self.device_name:
                 self.device_dropdown.set_selected_item(i)
                 break
 
     def load_info_content(self):
+        from ..internal.ConfigWidgets import InfoContentItem
+
         items = [
             InfoContentItem("Volume", InfoContent.VOLUME),
             InfoContentItem("Adjustment", InfoContent.ADJUSTMENT)
@@ -262,25 +276,27 @@ class DeviceBase(ActionBase):
             self.create_asset_manager_window()
             self.asset_manager_window.present()
 
-    def on_device_filter_changed(self, _, item: DeviceFilterItem, index):
+    def on_device_filter_changed(self, _, item: "DeviceFilterItem", index):
         settings = self.get_settings()
 
         self.device_filter = item.pulse_filter
         self.pulse_device_name = None
 
         self.load_device()
+        self.update_event_subscription()
         self.display_device_name()
         self.display_info()
 
         settings["device-filter"] = self.device_filter
         self.set_settings(settings)
 
-    def on_device_changed(self, _, item: SearchComboRowItem, index):
+    def on_device_changed(self, _, item: "SearchComboRowItem", index):
         settings = self.get_settings()
 
         self.device_name = item.display_label
 
         self.set_device_settings()
+        self.update_event_subscription()
 
         self.display_device_name()
         self.display_info()
@@ -292,6 +308,7 @@ class DeviceBase(ActionBase):
         settings = self.get_settings()
 
         self.use_standard = self.use_standard_toggle.get_active()
+        self.update_event_subscription()
 
         self.display_device_name()
         self.display_info()
@@ -308,7 +325,7 @@ class DeviceBase(ActionBase):
         settings["show-info"] = self.show_info
         self.set_settings(settings)
 
-    def on_info_content_changed(self, _, item: InfoContentItem, index):
+    def on_info_content_changed(self, _, item: "InfoContentItem", index):
         settings = self.get_settings()
 
         self.info_content = item.info_content
@@ -343,7 +360,38 @@ class DeviceBase(ActionBase):
         settings["nick"] = self.device_nick
         self.set_settings(settings)
 
-    async def on_asset_manager_change(self, *args):
+    def on_device_list_changed(self, event, device_filter: DeviceFilter):
+        if device_filter == self.device_filter:
+            GLib.idle_add(self.reload_device_dropdown)
+
+    def on_config_closed(self, *args):
+        self.flush_settings()
+        log.debug(f"Settings writes of {self.action_id}: {self.settings_write_behind.get_stats()}")
+
+        if self.config_ui is None:
+            return
+
+        self.plugin_base.device_list_model.remove_listener(self.on_device_list_changed)
+        self.config_ui.disconnect(self.config_closed_handler)
+        self.config_ui = None
+        self.config_closed_handler = None
+
+    def reload_device_dropdown(self):
+        try:
+            self.device_dropdown.handler_block_by_func(self.on_device_changed)
+        except TypeError:
+            # Not connected, e.g. while load_ui_settings runs
+            self.load_device()
+            return False
+
+        self.load_device()
+        self.device_dropdown.handler_unblock_by_func(self.on_device_changed)
+        return False
+
+    def on_asset_manager_change(self, *args):
+        pass
+
+    async def on_pulse_device_change(self, *args, **kwargs):
         pass
 
     #
@@ -351,6 +399,15 @@ class DeviceBase(ActionBase):
     #
 
     def on_ready(self):
+        # The key got (re-)created, nothing we pushed before is visible anymore
+        self.reset_render_state()
+        # Keys of a page get ready together, they are warmed up as one batch behind a single snapshot
+        self.plugin_base.page_warmup.add(self)
+
+    def warm_up(self):
+        """
+        Everything on_ready does once the page warm-up ran, subclasses extend this instead of on_ready
+        """
         self.load_settings()
         self.display_device_name()
         self.display_info()
@@ -384,37 +441,48 @@ class DeviceBase(ActionBase):
 
     def display_device_name(self):
         if not self.show_device_name:
-            self.set_top_label("")
+            self.display_top_label("")
             return
 
         if self.device_nick:
-            self.set_top_label(self.device_nick)
+            self.display_top_label(self.device_nick)
         elif self.use_standard:
             device = get_standard_device(self.device_filter)
             name = filter_proplist(device.proplist)
-            self.set_top_label(name)
+            self.display_top_label(name)
         else:
-            self.set_top_label(self.device_name)
+            self.display_top_label(self.device_name)
 
     def display_info(self):
-        if self.info_content == InfoContent.VOLUME:
-            info = self.display_volume()
-        elif self.info_content == InfoContent.ADJUSTMENT:
+        if self.show_info and self.info_content == InfoContent.VOLUME:
+            # Volume keys refreshing together get their volumes from one batched query per tick
+            self.plugin_base.volume_refresh.request(self)
+            return
+
+        if self.show_info and self.info_content == InfoContent.ADJUSTMENT:
             info = self.display_adjustment()
         else:
             info = ""
 
-        if not self.show_info:
-            info = ""
+        self.display_bottom_label(info)
 
-        self.set_bottom_label(info)
+    def on_volumes_refreshed(self, volumes: list[int]):
+        """
+        Called by the volume refresh with the volumes of get_volume_device_name()
+        """
+        # The settings might have changed since the refresh was requested
+        if self.show_info and self.info_content == InfoContent.VOLUME:
+            self.display_bottom_label(self.display_volume(volumes))
 
-    def display_volume(self):
+    def get_volume_device_name(self) -> str | None:
         if self.use_standard:
-            device_name = get_standard_device(self.device_filter).name
-            volumes = get_volumes_from_device(self.device_filter, device_name)
-        else:
-            volumes = get_volumes_from_device(self.device_filter, self.pulse_device_name)
+            device = get_standard_device(self.device_filter)
+            return device.name if device is not None else None
+        return self.pulse_device_name
+
+    def display_volume(self, volumes: list[int] = None):
+        if volumes is None:
+            volumes = get_volumes_from_device(self.device_filter, self.get_volume_device_name())
         if len(volumes) > 0:
             return str(int(volumes[0]))
         return "N/A"
@@ -422,26 +490,97 @@ class DeviceBase(ActionBase):
     def display_adjustment(self):
         return ""
 
+    # All key updates go through the plugins redraw scheduler, which drops unchanged values and caps the redraw rate
+
+    def display_icon_asset(self, asset_key: str):
+        """
+        Shows an icon of the asset manager, skipped if the key already shows the same version of that icon
+        """
+        icons = self.plugin_base.asset_manager.icons
+        render_key = (asset_key, icons.get_version(asset_key))
+
+        def _apply(update: bool):
+            render = self.plugin_base.asset_manager.get_icon_render(asset_key, size=self.get_key_image_size())
+
+            if render is not None:
+                self.set_media(render, update=update)
+
+        self.plugin_base.redraw_scheduler.queue(self, "media", render_key, _apply)
+
+    def get_key_image_size(self) -> tuple[int, int] | None:
+        """
+        Pixel size of the key this action sits on, None if unknown and the full render should be used
+        """
+        try:
+            return tuple(self.deck_controller.deck.key_image_format()["size"])
+        except Exception:
+            return None
+
+    def display_top_label(self, text: str):
+        self.plugin_base.redraw_scheduler.queue(self, "top", text, lambda update: self.set_top_label(text, update=update))
+
+    def display_bottom_label(self, text: str):
+        self.plugin_base.redraw_scheduler.queue(self, "bottom", text, lambda update: self.set_bottom_label(text, update=update))
+
+    def reset_render_state(self):
+        self.plugin_base.redraw_scheduler.reset(self)
+
     #
     # MISC
     #
 
     def set_device_settings(self):
-        for device in get_device_list(self.device_filter):
-            if device.description.__contains__("Monitor"):
-                continue
+        device = get_device_by_display_name(self.device_filter, self.device_name)
 
-            device_name = filter_proplist(device.proplist)
+        if device is not None:
+            self.device_index = device.index
+            self.pulse_device_name = device.name
 
-            if device_name == self.device_name:
-                self.device_index = device.index
-                self.pulse_device_name = device.name
-                break
+    def get_target_device(self):
+        if self.use_standard:
+            return get_standard_device(self.device_filter)
+        return get_device(self.device_filter, self.pulse_device_name)
+
+    def submit_command(self, func: callable, *args, on_done: callable = None) -> bool:
+        """
+        Queues func(device, *args) on the plugins command executor so the input thread returns immediately.
+        The device is resolved when the command runs, on_done defaults to on_command_done.
+        """
+        # Keyed by the device actually targeted, so actions following the standard device share its queue
+        pulse_device_name = get_standard_device_name(self.device_filter) if self.use_standard else self.pulse_device_name
+        key = (self.device_filter, pulse_device_name)
+
+        def _command():
+            device = self.get_target_device()
+
+            if device is None:
+                return False
+            return func(device, *args)
+
+        if self.plugin_base.command_executor.submit(key, _command, on_done or self.on_command_done):
+            return True
+
+        log.warning(f"Too many pending commands for device: {key}, dropping input")
+        self.show_error(1)
+        return False
+
+    def on_command_done(self, result, error):
+        if error is not None or result is False:
+            self.show_error(1)
+
+    def update_event_subscription(self):
+        """
+        Makes sure pulse events are only delivered for the device this action currently controls
+        """
+        pulse_device_name = None if self.use_standard else self.pulse_device_name
+        self.plugin_base.device_event_router.subscribe(self.on_pulse_device_change, self.device_filter, pulse_device_name)
 
     def translate(self, key):
         return self.plugin_base.locale_manager.get(key)
 
     def create_asset_manager_window(self):
+        from ..internal.ConfigWidgets import Window
+
         self.asset_manager_window = Window(self.plugin_base.asset_manager)
         self.asset_manager_window.connect("close-request", self.manager_destroyed)
 
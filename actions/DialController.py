@@ -1,62 +1,49 @@
 import enum
-import os
+import threading
 
 from loguru import logger as log
 
-from GtkHelper.GtkHelper import ScaleRow, BetterExpander
-from GtkHelper.SearchComboRow import SearchComboRow, SearchComboRowItem
 from ..actions.DeviceBase import DeviceBase
-from ..internal.AdwGrid import AdwGrid
+from ..internal.DialAccumulator import DialAccumulator
 
-from ..internal.PulseHelpers import get_device, mute, change_volume, set_volume, get_volumes_from_device, \
-    get_standard_device
+from ..internal.PulseHelpers import mute, change_volume, set_volume
 
 import gi
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
-from gi.repository import Gtk, Adw, GObject
+from gi.repository import Gtk, Adw
 
 class Behaviour(enum.StrEnum):
     MUTE = "mute",
     SET = "set_volume"
 
-class BehaviourItems(SearchComboRowItem):
-    def __init__(self, display_label, behaviour):
-        super().__init__(display_label)
-        self._behaviour = behaviour
-
-    @GObject.Property
-    def behaviour(self):
-        return self._behaviour
-
 class DialController(DeviceBase):
+    ASSET_KEYS: tuple[str, ...] = ("mute", "audio")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.plugin_base.connect_to_event(event_id="com_kawaiishay_AudioControl::PulseEvent",
-                                          callback=self.on_pulse_device_change)
-
         self.behaviour = Behaviour.MUTE
 
         self.volume_adjust: int = 1
         self.volume_bounds: int = 100
+        self.dial_window: int = 25  # Milliseconds dial detents get summed up before the volume is applied
 
         self.volume: int = 0
         self.extend_volume: bool = False
 
         self.is_muted: bool = False
 
-        self.behaviour_items = [
-            BehaviourItems("Mute", Behaviour.MUTE),
-            BehaviourItems("Set Volume", Behaviour.SET)
-        ]
+        self.dial_accumulator = DialAccumulator(self.apply_dial_change, self.dial_window / 1000)
 
-    def on_ready(self):
-        super().on_ready()
+    def warm_up(self):
+        super().warm_up()
         self.update_mute_image()
 
     def build_ui(self, ui: Adw.PreferencesGroup = None) -> Adw.PreferencesGroup:
+        from ..internal.ConfigWidgets import ScaleRow
+
         self.ui = super().build_ui()
 
         self.volume_adjust_scale = ScaleRow(title=self.translate("adjust-vol-scale"), value=0, min=-50, max=50, step=1, text_left="-50",
@@ -72,6 +59,13 @@ class DialController(DeviceBase):
         self.settings_grid.add_widget(self.volume_adjust_scale, 0, 3)
         self.settings_grid.add_widget(self.volume_bound_scale, 1, 3)
 
+        self.dial_window_scale = ScaleRow(title=self.translate("dial-window-scale"), value=25, min=5, max=100, step=1, text_left="5",
+                                          text_right="100")
+        self.dial_window_scale.scale.set_draw_value(True)
+        self.dial_window_scale.scale.set_size_request(100, 30)
+
+        self.settings_grid.add_widget(self.dial_window_scale, 0, 4)
+
         self.ui.add(self._build_behaviour_group())
         self._create_set_volume_ui()
 
@@ -80,6 +74,13 @@ class DialController(DeviceBase):
         return self.ui
 
     def _build_behaviour_group(self):
+        from ..internal.ConfigWidgets import BetterExpander, SearchComboRow, BehaviourItems
+
+        self.behaviour_items = [
+            BehaviourItems("Mute", Behaviour.MUTE),
+            BehaviourItems("Set Volume", Behaviour.SET)
+        ]
+
         behaviour_group = Adw.PreferencesGroup(title=self.translate("dial-behaviour-group"))
 
         self.behaviour_expander = BetterExpander(title=self.translate("dial-behaviour-extender"))
@@ -93,6 +94,8 @@ class DialController(DeviceBase):
         return behaviour_group
 
     def _create_set_volume_ui(self):
+        from ..internal.ConfigWidgets import ScaleRow, AdwGrid
+
         self.extend_volume_toggle = Adw.SwitchRow(title=self.translate("set-extend-toggle"))
 
         self.volume_scale = ScaleRow(title=self.translate("set-vol-scale"), value=0, min=0, max=100, step=1, text_left="0", text_right="100")
@@ -118,6 +121,8 @@ class DialController(DeviceBase):
 
         self.volume_adjust = settings.get("volume-adjust", 1)
         self.volume_bounds = settings.get("volume-bounds", 100)
+        self.dial_window = settings.get("dial-window", 25)
+        self.dial_accumulator.window = self.dial_window / 1000
 
         self.volume = settings.get("volume", 0)
         self.extend_volume = settings.get("volume-extend", False)
@@ -137,6 +142,7 @@ class DialController(DeviceBase):
 
         self.volume_adjust_scale.scale.set_value(self.volume_adjust)
         self.volume_bound_scale.scale.set_value(self.volume_bounds)
+        self.dial_window_scale.scale.set_value(self.dial_window)
 
         self.extend_volume_toggle.set_active(self.extend_volume)
 
@@ -155,6 +161,7 @@ class DialController(DeviceBase):
 
         self.volume_adjust_scale.scale.connect("value-changed", self.on_volume_adjust_changed)
         self.volume_bound_scale.scale.connect("value-changed", self.on_volume_bounds_changed)
+        self.dial_window_scale.scale.connect("value-changed", self.on_dial_window_changed)
 
         self.behaviour_dropdown.connect("item-changed", self.on_behaviour_dropdown_changed)
         self.extend_volume_toggle.connect("notify::active", self.on_extend_volume_changed)
@@ -165,6 +172,7 @@ class DialController(DeviceBase):
         try:
             self.volume_adjust_scale.scale.disconnect_by_func(self.on_volume_adjust_changed)
             self.volume_bound_scale.scale.disconnect_by_func(self.on_volume_bounds_changed)
+            self.dial_window_scale.scale.disconnect_by_func(self.on_dial_window_changed)
 
             self.behaviour_dropdown.disconnect_by_func(self.on_behaviour_dropdown_changed)
             self.extend_volume_toggle.disconnect_by_func(self.on_extend_volume_changed)
@@ -174,24 +182,24 @@ class DialController(DeviceBase):
             pass
 
     def on_volume_adjust_changed(self, *args, **kwargs):
-        settings = self.get_settings()
-
         self.volume_adjust = self.volume_adjust_scale.scale.get_value()
 
         self.display_info()
 
-        settings["volume-adjust"] = self.volume_adjust
-        self.set_settings(settings)
+        self.set_setting_deferred("volume-adjust", self.volume_adjust)
 
     def on_volume_bounds_changed(self, *args, **kwargs):
-        settings = self.get_settings()
-
         self.volume_bounds = self.volume_bound_scale.scale.get_value()
 
-        settings["volume-bounds"] = self.volume_bounds
-        self.set_settings(settings)
+        self.set_setting_deferred("volume-bounds", self.volume_bounds)
 
-    def on_behaviour_dropdown_changed(self, _, item: BehaviourItems, index):
+    def on_dial_window_changed(self, *args, **kwargs):
+        self.dial_window = int(self.dial_window_scale.scale.get_value())
+        self.dial_accumulator.window = self.dial_window / 1000
+
+        self.set_setting_deferred("dial-window", self.dial_window)
+
+    def on_behaviour_dropdown_changed(self, _, item: "BehaviourItems", index):
         settings = self.get_settings()
 
         self.behaviour = item.behaviour
@@ -227,14 +235,11 @@ class DialController(DeviceBase):
         self.update_mute_image()
 
     def on_volume_changed(self, *args):
-        settings = self.get_settings()
-
         self.volume = self.volume_scale.scale.get_value()
 
         self.display_info()
 
-        settings["volume"] = self.volume
-        self.set_settings(settings)
+        self.set_setting_deferred("volume", self.volume)
 
     def on_device_changed(self, *args, **kwargs):
         super().on_device_changed(*args, **kwargs)
@@ -244,27 +249,18 @@ class DialController(DeviceBase):
         if len(args) < 2:
             return
 
-        event = args[1]
+        try:
+            device = self.get_target_device()
+            self.is_muted = bool(device.mute)
 
-        if self.use_standard:
-            device = get_standard_device(self.device_filter)
-            index = device.index
-        else:
-            index = self.device_index
-
-        if event.index == index:
-            try:
-                if self.use_standard:
-                    device = get_standard_device(self.device_filter)
-                else:
-                    device = get_device(self.device_filter, self.pulse_device_name)
-                self.is_muted = bool(device.mute)
-
-                self.display_mute_image()
-                self.display_info()
-            except Exception as e:
-                log.error(e)
-                self.show_error(1)
+            self.display_mute_image()
+            self.display_info()
+        except Exception as e:
+            log.error(e)
+            self.show_error(1)
+
+    def on_asset_manager_change(self, *args):
+        self.display_mute_image()
 
     def on_dial_down(self):
         if self.pulse_device_name is None:
@@ -281,45 +277,46 @@ class DialController(DeviceBase):
             self.show_error(1)
             return
 
-        try:
-            if self.use_standard:
-                device = get_standard_device(self.device_filter)
-            else:
-                device = get_device(self.device_filter, self.pulse_device_name)
-
-            # Decreasing Volume
-            if direction < 0:
-                change_volume(device, -self.volume_adjust)
-                return
-            else:
-                change_volume(device, self.volume_adjust)
-        except Exception as e:
-            log.error(e)
+        target = self.dial_accumulator.add(direction * int(self.volume_adjust), self.get_current_volume, int(self.volume_bounds))
+
+        if target is None:
             self.show_error(1)
+            return
+
+        self.display_info()
+
+    def apply_dial_change(self, adjust: int) -> bool:
+        # Runs on the accumulator thread, waiting keeps the accumulator from piling up changes on the executor.
+        # A relative change keeps the channel balance.
+        done = threading.Event()
+        succeeded = False
+
+        def _on_done(result, error):
+            nonlocal succeeded
+            succeeded = error is None and result is not False
+            self.on_command_done(result, error)
+            done.set()
+
+        if not self.submit_command(change_volume, adjust, int(self.volume_bounds), on_done=_on_done):
+            return False
+
+        return done.wait(timeout=1) and succeeded
 
     def mute_behaviour(self):
-        try:
-            if self.use_standard:
-                device = get_standard_device(self.device_filter)
-            else:
-                device = get_device(self.device_filter, self.pulse_device_name)
-            self.is_muted = not device.mute
-            mute(device, self.is_muted)
-            self.display_mute_image()
-        except Exception as e:
-            log.error(e)
+        self.is_muted = not self.is_muted
+        self.display_mute_image()
+
+        if not self.submit_command(mute, self.is_muted, on_done=self.on_mute_done):
+            # Rejected, the device was never touched
+            self.update_mute_image()
+
+    def on_mute_done(self, result, error):
+        if error is not None or result is False:
             self.show_error(1)
+            self.update_mute_image()
 
     def set_volume_behaviour(self):
-        try:
-            if self.use_standard:
-                device = get_standard_device(self.device_filter)
-            else:
-                device = get_device(self.device_filter, self.pulse_device_name)
-            set_volume(device, self.volume)
-        except Exception as e:
-            log.error(e)
-            self.show_error(1)
+        self.submit_command(set_volume, self.volume)
 
     #
     # MISC
@@ -328,12 +325,28 @@ class DialController(DeviceBase):
     def display_adjustment(self):
         return str(self.volume_adjust)
 
+    def display_volume(self, volumes: list[int] = None):
+        # Shows where a running dial turn is heading instead of the last volume the server reported
+        target = self.dial_accumulator.get_target()
+
+        if target is not None:
+            return str(target)
+        return super().display_volume(volumes)
+
+    def get_current_volume(self) -> int | None:
+        device = self.get_target_device()
+
+        if device is None:
+            return None
+        return round(max(device.volume.values) * 100)
+
+    def get_key_image_size(self) -> tuple[int, int] | None:
+        # Dial images end up on the touchscreen, which StreamController lays out itself
+        return None
+
     def update_mute_image(self):
         try:
-            if self.use_standard:
-                device = get_standard_device(self.device_filter)
-            else:
-                device = get_device(self.device_filter, self.pulse_device_name)
+            device = self.get_target_device()
             self.is_muted = bool(device.mute)
             self.display_mute_image()
         except:
@@ -341,6 +354,6 @@ class DialController(DeviceBase):
 
     def display_mute_image(self):
         if self.is_muted:
-            self.set_media(media_path=os.path.join(self.plugin_base.PATH, "assets", "mute.png"))
+            self.display_icon_asset("mute")
         else:
-            self.set_media(media_path=os.path.join(self.plugin_base.PATH, "assets", "audio.png"))
+            self.display_icon_asset("audio")
@@ -1,22 +1,17 @@
-import os
-
-import pulsectl
-from loguru import logger as log
-
 from ..actions.DeviceBase import DeviceBase
-from ..internal.PulseHelpers import get_device, mute, get_volumes_from_device, get_standard_device
+from ..internal.PulseHelpers import mute
 
 
 class Mute(DeviceBase):
+    ASSET_KEYS: tuple[str, ...] = ("mute", "audio")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.plugin_base.connect_to_event(event_id="com_kawaiishay_AudioControl::PulseEvent",
-                                          callback=self.on_pulse_device_change)
         self.is_muted: bool = False
 
-    def on_ready(self):
-        super().on_ready()
+    def warm_up(self):
+        super().warm_up()
         self.update_mute_image()
 
     #
@@ -35,48 +30,34 @@ class Mute(DeviceBase):
         if len(args) < 2:
             return
 
-        event = args[1]
-
-        if self.use_standard:
-            device = get_standard_device(self.device_filter)
-            index = device.index
-        else:
-            index = self.device_index
-
-        if event.index == index:
-            with pulsectl.Pulse("mute-event") as pulse:
-                try:
-                    if self.use_standard:
-                        device = get_standard_device(self.device_filter)
-                    else:
-                        device = get_device(self.device_filter, self.pulse_device_name)
-                    self.is_muted = bool(device.mute)
-                    self.display_mute_image()
-                    self.display_info()
-                except:
-                    self.show_error(1)
+        try:
+            device = self.get_target_device()
+            self.is_muted = bool(device.mute)
+            self.display_mute_image()
+            self.display_info()
+        except:
+            self.show_error(1)
 
     def on_key_down(self):
         if self.pulse_device_name is None:
             self.show_error(1)
             return
 
-        try:
-            if self.use_standard:
-                device = get_standard_device(self.device_filter)
-            else:
-                device = get_device(self.device_filter, self.pulse_device_name)
+        # Toggle optimistically, pulse events keep is_muted in sync with the device
+        self.is_muted = not self.is_muted
+        self.display_mute_image()
 
-            self.is_muted = not device.mute
-            mute(device, self.is_muted)
-            self.display_mute_image()
-        except Exception as e:
-            log.error(e)
+        if not self.submit_command(mute, self.is_muted, on_done=self.on_mute_done):
+            # Rejected, the device was never touched
+            self.update_mute_image()
+
+    def on_mute_done(self, result, error):
+        if error is not None or result is False:
             self.show_error(1)
+            self.update_mute_image()
 
-    async def on_asset_manager_change(self, *args):
-        if args[1] == "mute" or args[1] == "audio":
-            self.display_mute_image()
+    def on_asset_manager_change(self, *args):
+        self.display_mute_image()
 
     #
     # MISC
@@ -84,10 +65,7 @@ class Mute(DeviceBase):
 
     def update_mute_image(self):
         try:
-            if self.use_standard:
-                device = get_standard_device(self.device_filter)
-            else:
-                device = get_device(self.device_filter, self.pulse_device_name)
+            device = self.get_target_device()
             self.is_muted = bool(device.mute)
             self.display_mute_image()
         except:
@@ -104,7 +82,6 @@ class Mute(DeviceBase):
 
     def display_mute_image(self):
         if self.is_muted:
-            _, render = self.plugin_base.asset_manager.icons.get_asset_values("mute")
+            self.display_icon_asset("mute")
         else:
-            _, render = self.plugin_base.asset_manager.icons.get_asset_values("audio")
-        self.set_media(render)
\ No newline at end of file
+            self.display_icon_asset("audio")
\ No newline at end of file
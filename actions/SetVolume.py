@@ -1,32 +1,30 @@
 import gi
 
-from GtkHelper.GtkHelper import ScaleRow
 from ..actions.DeviceBase import DeviceBase
-from ..internal.AdwGrid import AdwGrid
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 from gi.repository import Adw, Gtk
-from loguru import logger as log
 
-from ..internal.PulseHelpers import get_device, set_volume, get_standard_device
+from ..internal.PulseHelpers import set_volume
 
 
 class SetVolume(DeviceBase):
+    ASSET_KEYS: tuple[str, ...] = ("audio",)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.plugin_base.connect_to_event(event_id="com_kawaiishay_AudioControl::PulseEvent",
-                                          callback=self.on_pulse_device_change)
-
         self.volume: int = 0
         self.extend_volume: bool = False
 
-    def on_ready(self):
-        super().on_ready()
+    def warm_up(self):
+        super().warm_up()
         self.display_audio_image()
 
     def build_ui(self, ui: Adw.PreferencesGroup = None) -> Adw.PreferencesGroup:
+        from ..internal.ConfigWidgets import ScaleRow
+
         self.ui = super().build_ui()
 
         self.extend_volume_toggle = Adw.SwitchRow(title=self.translate("set-extend-toggle"))
@@ -99,62 +97,37 @@ class SetVolume(DeviceBase):
         self.set_settings(settings)
 
     def on_volume_changed(self, *args, **kwargs):
-        settings = self.get_settings()
-
         self.volume = self.volume_scale.scale.get_value()
 
         self.display_info()
 
-        settings["volume"] = self.volume
-        self.set_settings(settings)
+        self.set_setting_deferred("volume", self.volume)
 
     def on_key_down(self):
         if None in (self.pulse_device_name, self.volume):
             self.show_error(1)
             return
 
-        try:
-            if self.use_standard:
-                device = get_standard_device(self.device_filter)
-            else:
-                device = get_device(self.device_filter, self.pulse_device_name)
-            set_volume(device, self.volume)
-        except Exception as e:
-            log.error(e)
-            self.show_error(1)
+        self.submit_command(set_volume, self.volume)
 
     async def on_pulse_device_change(self, *args, **kwargs):
         if len(args) < 2:
             return
 
-        event = args[1]
-
-        if self.use_standard:
-            device = get_standard_device(self.device_filter)
-            index = device.index
-        else:
-            index = self.device_index
-
-        if event.index == index:
-            try:
-                self.display_info()
-            except:
-                self.show_error(1)
+        try:
+            self.display_info()
+        except:
+            self.show_error(1)
 
-    async def on_asset_manager_change(self, *args):
-        if args[1] == "audio":
-            self.display_audio_image()
+    def on_asset_manager_change(self, *args):
+        self.display_audio_image()
 
     #
     # DISPLAY
     #
 
     def display_audio_image(self):
-        result = self.plugin_base.asset_manager.icons.get_asset_values("audio")
-
-        if result:
-            _, render = result
-            self.set_media(render)
+        self.display_icon_asset("audio")
 
     def display_adjustment(self):
         return self.volume
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Measures how long an asset override change takes to dispatch with many actions listening.
+
+"filtered" subscribes every listener to the keys it shows (like the actions do now), "unfiltered" subscribes them
+to everything and lets them check the key themselves (like the actions did before). Only every fourth listener
+cares about the changed key, the filtered dispatch only pays for those.
+
+Run from the repository root: python benchmarks/asset_dispatch.py [--iterations N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from internal.AssetManager.AssetManagerBackend import Manager, Asset, ManagerEvent
+
+KEYS = ["mute", "audio", "vol-up", "vol-down"]
+KEYS_PER_ACTION = [("mute", "audio"), ("audio",), ("vol-up", "vol-down"), ("mute", "audio")]
+LISTENER_COUNTS = [1, 32, 128, 256, 512]
+
+
+class Listener:
+    def __init__(self, keys: tuple[str, ...]):
+        self.keys = keys
+        self.calls = 0
+
+    def on_filtered(self, *args):
+        self.calls += 1
+
+    def on_unfiltered(self, *args):
+        if args[1] in self.keys:
+            self.calls += 1
+
+
+def run(count: int, filtered: bool, iterations: int) -> float:
+    manager = Manager(Asset, "bench")
+    for key in KEYS:
+        manager.add_asset(key, Asset())
+
+    listeners = [Listener(KEYS_PER_ACTION[i % len(KEYS_PER_ACTION)]) for i in range(count)]
+    for listener in listeners:
+        if filtered:
+            manager.add_listener(listener.on_filtered, keys=set(listener.keys), events={ManagerEvent.OVERRIDE_ADD})
+        else:
+            manager.add_listener(listener.on_unfiltered)
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        manager.add_override("vol-up", Asset(), override=True)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'listeners':>10} {'unfiltered us':>14} {'filtered us':>12}")
+    for count in LISTENER_COUNTS:
+        unfiltered = run(count, False, args.iterations)
+        filtered = run(count, True, args.iterations)
+        print(f"{count:>10} {unfiltered:>14.2f} {filtered:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
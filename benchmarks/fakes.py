@@ -0,0 +1,348 @@
+"""
+Stand-ins for the StreamController plugin API and an in-process Pulse server, so the plugin can be started
+without a running StreamController or sound server. Only what the plugin touches is implemented.
+
+install() has to be called before the plugin is imported.
+"""
+
+import os
+import sys
+import threading
+import time
+import types
+from types import SimpleNamespace
+
+
+#
+# PULSE
+#
+
+class FakeDevice:
+    def __init__(self, index: int, name: str, description: str, nick: str):
+        self.index = index
+        self.name = name
+        self.description = description
+        self.proplist = {"device.description": description, "node.nick": nick, "node.name": name}
+        self.volume = SimpleNamespace(values=[0.5, 0.5])
+        self.channel_count = 2
+        self.mute = 0
+
+
+class FakePulseServer:
+    """
+    Device state shared by all fake clients. Every request sleeps latency seconds to stand in for the IPC round trip.
+    """
+
+    def __init__(self, devices: int = 8, latency: float = 0.0002):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests: int = 0
+
+        self.sinks = [FakeDevice(i, f"sink.{i}", f"Sink {i}", f"Speaker {i}") for i in range(devices)]
+        self.sources = [FakeDevice(i, f"source.{i}", f"Source {i}", f"Microphone {i}") for i in range(devices)]
+        self.sources += [FakeDevice(devices + i, f"sink.{i}.monitor", f"Monitor of Sink {i}", f"Monitor {i}")
+                         for i in range(devices)]
+
+    def request(self):
+        with self.lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+
+class PulseError(Exception):
+    pass
+
+
+class PulseDisconnected(PulseError):
+    pass
+
+
+class PulseIndexError(PulseError):
+    pass
+
+
+class PulseSinkInfo(FakeDevice):
+    pass
+
+
+class PulseSourceInfo(FakeDevice):
+    pass
+
+
+class Pulse:
+    server: FakePulseServer = None
+
+    def __init__(self, client_name: str = None, *args, **kwargs):
+        self.client_name = client_name
+        self.connected = True
+        self._event_callback = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.connected = False
+
+    def _find(self, devices: list, match):
+        self.server.request()
+        for device in devices:
+            if match(device):
+                return device
+        raise PulseIndexError()
+
+    def server_info(self):
+        self.server.request()
+        return SimpleNamespace(default_sink_name=self.server.sinks[0].name, default_source_name=self.server.sources[0].name)
+
+    def sink_list(self):
+        self.server.request()
+        return list(self.server.sinks)
+
+    def source_list(self):
+        self.server.request()
+        return list(self.server.sources)
+
+    def sink_info(self, index: int):
+        return self._find(self.server.sinks, lambda device: device.index == index)
+
+    def source_info(self, index: int):
+        return self._find(self.server.sources, lambda device: device.index == index)
+
+    def get_sink_by_name(self, name: str):
+        return self._find(self.server.sinks, lambda device: device.name == name)
+
+    def get_source_by_name(self, name: str):
+        return self._find(self.server.sources, lambda device: device.name == name)
+
+    def volume_change_all_chans(self, device, delta: float):
+        self.server.request()
+        device.volume.values = [max(0.0, value + delta) for value in device.volume.values]
+
+    def volume_set_all_chans(self, device, volume: float):
+        self.server.request()
+        device.volume.values = [volume for _ in device.volume.values]
+
+    def mute(self, device, state: bool):
+        self.server.request()
+        device.mute = int(state)
+
+    def event_mask_set(self, *masks):
+        pass
+
+    def event_callback_set(self, callback):
+        self._event_callback = callback
+
+    def event_listen(self, timeout: float = None):
+        # The benchmark doesn't emit events, just don't spin
+        time.sleep(timeout or 1)
+
+
+#
+# STREAMCONTROLLER
+#
+
+class FakeLocaleManager:
+    def get(self, key: str) -> str:
+        return key
+
+
+class PluginBase:
+    def __init__(self, *args, **kwargs):
+        self.PATH = PLUGIN_PATH
+        self.locale_manager = FakeLocaleManager()
+        self.action_holders = []
+        self.event_holders = []
+        self._settings: dict = {}
+
+    def get_settings(self) -> dict:
+        return dict(self._settings)
+
+    def set_settings(self, settings: dict):
+        self._settings = dict(settings)
+
+    def add_action_holder(self, holder):
+        self.action_holders.append(holder)
+
+    def add_event_holder(self, holder):
+        self.event_holders.append(holder)
+
+    def register(self, *args, **kwargs):
+        pass
+
+
+class ActionHolder:
+    def __init__(self, plugin_base=None, action_base=None, action_id_suffix: str = None, action_name: str = None,
+                 action_support: dict = None, **kwargs):
+        self.plugin_base = plugin_base
+        self.action_base = action_base
+        self.action_id_suffix = action_id_suffix
+        self.action_name = action_name
+        self.action_support = action_support
+
+
+class EventHolder:
+    def __init__(self, plugin_base=None, event_id: str = None):
+        self.plugin_base = plugin_base
+        self.event_id = event_id
+
+    def trigger_event(self, *args, **kwargs):
+        pass
+
+
+class LabelTracker:
+    """
+    Counts the actions that pushed their first label or image to the deck.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self.started: float = None
+        self.first: float = None
+        self.last: float = None
+        self.seen: set[int] = set()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.perf_counter()
+            self.first = None
+            self.last = None
+            self.seen.clear()
+
+    def record(self, action):
+        with self.lock:
+            if id(action) in self.seen:
+                return
+
+            self.last = time.perf_counter()
+            if self.first is None:
+                self.first = self.last
+            self.seen.add(id(action))
+            self.condition.notify_all()
+
+    def wait_for(self, count: int, timeout: float) -> float | None:
+        """
+        :return: Seconds from reset() until count actions rendered, None on timeout
+        """
+        deadline = time.perf_counter() + timeout
+
+        with self.lock:
+            while len(self.seen) < count:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+            return self.last - self.started
+
+
+label_tracker = LabelTracker()
+
+
+class FakeDeck:
+    def key_image_format(self) -> dict:
+        return {"size": (72, 72)}
+
+
+class ActionBase:
+    def __init__(self, *args, **kwargs):
+        self.plugin_base = kwargs.get("plugin_base")
+        self.deck_controller = SimpleNamespace(deck=FakeDeck())
+        self.action_id = kwargs.get("action_id")
+        self._settings: dict = {}
+
+    def get_settings(self) -> dict:
+        return dict(self._settings)
+
+    def set_settings(self, settings: dict):
+        self._settings = dict(settings)
+
+    def set_media(self, *args, **kwargs):
+        label_tracker.record(self)
+
+    def set_top_label(self, *args, **kwargs):
+        label_tracker.record(self)
+
+    def set_bottom_label(self, *args, **kwargs):
+        label_tracker.record(self)
+
+    def show_error(self, *args, **kwargs):
+        pass
+
+    def hide_error(self, *args, **kwargs):
+        pass
+
+
+class _Events(SimpleNamespace):
+    pass
+
+
+class Input:
+    class Key:
+        Events = _Events(SHORT_UP="short-up", HOLD_START="hold-start")
+
+    class Dial:
+        Events = _Events(SHORT_UP="dial-short-up", HOLD_START="dial-hold-start", TURN_CW="turn-cw", TURN_CCW="turn-ccw")
+
+
+class InputEvent(str):
+    pass
+
+
+class ActionInputSupport:
+    SUPPORTED = "supported"
+    UNTESTED = "untested"
+    UNSUPPORTED = "unsupported"
+
+
+class Media:
+    def __init__(self, path: str):
+        self.path = path
+
+    @classmethod
+    def from_path(cls, path: str):
+        return cls(path)
+
+    def get_final_media(self):
+        from PIL import Image
+
+        with Image.open(self.path) as image:
+            return image.convert("RGBA")
+
+
+PLUGIN_PATH: str = None
+
+
+def _module(name: str, **attributes) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def install(plugin_path: str, server: FakePulseServer):
+    global PLUGIN_PATH
+    PLUGIN_PATH = plugin_path
+    Pulse.server = server
+
+    _module("pulsectl", Pulse=Pulse, PulseError=PulseError, PulseDisconnected=PulseDisconnected,
+            PulseIndexError=PulseIndexError, PulseSinkInfo=PulseSinkInfo, PulseSourceInfo=PulseSourceInfo)
+
+    for package in ("src", "src.backend", "src.backend.PluginManager", "src.backend.DeckManagement",
+                    "src.backend.DeckManagement.Media"):
+        _module(package, __path__=[])
+
+    _module("src.backend.PluginManager.PluginBase", PluginBase=PluginBase)
+    _module("src.backend.PluginManager.ActionBase", ActionBase=ActionBase)
+    _module("src.backend.PluginManager.ActionHolder", ActionHolder=ActionHolder)
+    _module("src.backend.PluginManager.ActionInputSupport", ActionInputSupport=ActionInputSupport)
+    _module("src.backend.PluginManager.EventHolder", EventHolder=EventHolder)
+    _module("src.backend.DeckManagement.InputIdentifier", Input=Input, InputEvent=InputEvent)
+    _module("src.backend.DeckManagement.Media.Media", Media=Media)
+
+
+def plugin_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
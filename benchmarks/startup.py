@@ -0,0 +1,124 @@
+"""
+Measures plugin startup against the fakes in fakes.py:
+
+- import_ms: importing the plugin's main module
+- register_ms: AudioControl() up to and including its register() call
+- on_ready_ms: calling on_ready() on every action
+- first_label_ms / all_labels_ms: from the first on_ready() until the first / every action pushed a label or image
+
+Every (action, count) pair runs in its own interpreter so imports and caches start cold. Results are printed as
+JSON (or written to --output) for tracking them over time.
+
+Needs the plugin's real dependencies except StreamController and a sound server (gi, loguru, Pillow).
+Run from the repository root: python benchmarks/startup.py [--counts 1 32 256] [--output results.json]
+"""
+
+import argparse
+import datetime
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fakes
+
+ACTIONS = ["Mute", "SetVolume", "AdjustVolume", "VolumeDisplay", "DialController"]
+COUNTS = [1, 32, 256]
+PACKAGE_NAME = "com_kawaiishay_AudioControl"
+
+
+def run_scenario(action_name: str, count: int, devices: int, latency: float, timeout: float) -> dict:
+    fakes.install(fakes.plugin_root(), fakes.FakePulseServer(devices=devices, latency=latency))
+
+    package = types.ModuleType(PACKAGE_NAME)
+    package.__path__ = [fakes.plugin_root()]
+    sys.modules[PACKAGE_NAME] = package
+
+    start = time.perf_counter()
+    main = importlib.import_module(f"{PACKAGE_NAME}.main")
+    import_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plugin = main.AudioControl()
+    register_time = time.perf_counter() - start
+
+    holder = next(holder for holder in plugin.action_holders if holder.action_id_suffix == action_name)
+    actions = [holder.action_base(plugin_base=plugin, action_id=f"{action_name}-{i}") for i in range(count)]
+
+    fakes.label_tracker.reset()
+    start = time.perf_counter()
+    for action in actions:
+        action.on_ready()
+    on_ready_time = time.perf_counter() - start
+
+    all_labels_time = fakes.label_tracker.wait_for(count, timeout)
+    first = fakes.label_tracker.first
+
+    return {
+        "action": action_name,
+        "count": count,
+        "import_ms": import_time * 1000,
+        "register_ms": register_time * 1000,
+        "on_ready_ms": on_ready_time * 1000,
+        "first_label_ms": (first - fakes.label_tracker.started) * 1000 if first is not None else None,
+        "all_labels_ms": all_labels_time * 1000 if all_labels_time is not None else None,
+        "pulse_requests": fakes.Pulse.server.requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--actions", nargs="+", default=ACTIONS, choices=ACTIONS)
+    parser.add_argument("--counts", nargs="+", type=int, default=COUNTS)
+    parser.add_argument("--devices", type=int, default=8, help="Sinks and sources on the fake server")
+    parser.add_argument("--latency-ms", type=float, default=0.2, help="Simulated round trip of every Pulse request")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for all labels")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    parser.add_argument("--scenario", nargs=2, metavar=("ACTION", "COUNT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        result = run_scenario(args.scenario[0], int(args.scenario[1]), args.devices, args.latency_ms / 1000, args.timeout)
+        print(json.dumps(result))
+        # Plugin threads are daemons, but atexit hooks and the event listener shouldn't hold the run up
+        sys.stdout.flush()
+        os._exit(0)
+
+    results = []
+    for action_name in args.actions:
+        for count in args.counts:
+            process = subprocess.run([sys.executable, os.path.abspath(__file__), "--scenario", action_name, str(count),
+                                      "--devices", str(args.devices), "--latency-ms", str(args.latency_ms),
+                                      "--timeout", str(args.timeout)],
+                                     capture_output=True, text=True)
+
+            if process.returncode != 0:
+                results.append({"action": action_name, "count": count, "error": process.stderr.strip().splitlines()[-1:]})
+                continue
+
+            results.append(json.loads(process.stdout.strip().splitlines()[-1]))
+
+    report = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "devices": args.devices,
+        "latency_ms": args.latency_ms,
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,16 @@ Author: G4PLS
 Year: 2024
 """
 
+import atexit
 import json
 import os.path
+import stat
+import threading
+import time
+from collections import OrderedDict
+
+from loguru import logger as log
+from PIL import Image
 
 from .AssetManagerBackend import Asset, Manager
 from src.backend.DeckManagement.Media.Media import Media
@@ -29,10 +37,109 @@ class Color(Asset):
     def from_json(cls, *args):
         return cls(color=tuple(args[0]))
 
+class RenderCache:
+    """
+    LRU of decoded icons shared by all Icon assets, bounded by the approximate memory of the renders.
+
+    Next to the full render, scaled variants (e.g. the deck key size or the asset window preview) are kept under
+    (path, size), so repeated renders reuse the already resampled image.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, tuple[int, int] | None], tuple[Media, object, int]] = OrderedDict()
+        self._bytes: int = 0
+
+    def get(self, path: str):
+        key = (path, None)
+
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry[0], entry[1]
+
+        icon = Media.from_path(path)
+        rendered = icon.get_final_media()
+        self._store(key, icon, rendered)
+
+        return icon, rendered
+
+    def get_scaled(self, path: str, size: tuple[int, int]):
+        """
+        Render of path fitted into size, keeping the aspect ratio.
+        """
+        key = (path, tuple(size))
+
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry[1]
+
+        _, rendered = self.get(path)
+        if rendered is None:
+            return None
+
+        scaled = self._scale(rendered, key[1])
+        self._store(key, None, scaled)
+
+        return scaled
+
+    def invalidate(self, path: str):
+        """
+        Drops the render and all scaled variants of path.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path]:
+                self._bytes -= self._entries.pop(key)[2]
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key, icon, rendered):
+        size = self._estimate_size(rendered)
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (icon, rendered, size)
+                self._bytes += size
+                self._evict()
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone is over budget
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+    def _scale(self, rendered, size: tuple[int, int]):
+        scale = min(size[0] / rendered.width, size[1] / rendered.height)
+        new_size = (max(1, int(rendered.width * scale)), max(1, int(rendered.height * scale)))
+
+        if new_size == rendered.size:
+            return rendered
+        return rendered.resize(new_size, Image.Resampling.LANCZOS)
+
+    def _estimate_size(self, rendered) -> int:
+        try:
+            return rendered.width * rendered.height * len(rendered.getbands())
+        except Exception:
+            return 0
+
+
+render_cache = RenderCache()
+
+
 class Icon(Asset):
+    """
+    Only remembers the path, the image is decoded on first use and kept in the shared render_cache.
+    """
+
     def __init__(self, *args, **kwargs):
-        self._icon: Media = None
-        self._rendered: Media = None
         self._path: str = None
 
         super().__init__(*args, **kwargs)
@@ -40,13 +147,21 @@ class Icon(Asset):
     def change(self, *args, **kwargs):
         path = kwargs.get("path", None)
 
-        if os.path.isfile(path):
+        if path and os.path.isfile(path):
             self._path = path
-            self._icon = Media.from_path(path)
-            self._rendered = self._icon.get_final_media()
 
     def get_values(self):
-        return self._icon, self._rendered
+        if self._path is None:
+            return None, None
+        return render_cache.get(self._path)
+
+    def get_scaled(self, size: tuple[int, int]):
+        """
+        Render fitted into size, cached per size until the override changes.
+        """
+        if self._path is None:
+            return None
+        return render_cache.get_scaled(self._path, size)
 
     def to_json(self):
         return self._path
@@ -56,19 +171,111 @@ class Icon(Asset):
         return cls(path=args[0])
 
 class AssetManager:
-    def __init__(self, save_path: str):
+    """
+    Overrides are written behind: save() only schedules a write, saves within save_delay seconds are coalesced
+    and the file is replaced atomically from a writer thread. Pending writes are flushed when the plugin shuts down
+    or the process exits.
+    """
+
+    def __init__(self, save_path: str, save_delay: float = 0.5):
         self.save_path = save_path
+        self.save_delay = save_delay
         self.colors = Manager(Color, "colors")
         self.icons = Manager(Icon, "icons")
+
+        self._save_condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._pending_json: dict = None
+        self._save_due: float = 0
+
         self.load()
 
+        self._writer = threading.Thread(target=self._work, daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def get_icon_render(self, key: str, size: tuple[int, int] = None):
+        """
+        Render of an icon (override first), decoded on first use and shared through the render_cache.
+        :param size: Returns a variant pre-scaled to fit into size instead of the full render
+        """
+        asset = self.icons.get_asset(key)
+        if asset is None:
+            return None
+
+        if size is not None:
+            return asset.get_scaled(size)
+
+        _, render = asset.get_values()
+        return render
+
     def save(self):
+        # The snapshot is taken right away, so the writer thread never reads the managers while the UI changes them
         save_json = {}
         save_json[self.colors.get_save_key()] = self.colors.get_override_json()
         save_json[self.icons.get_save_key()] = self.icons.get_override_json()
 
-        with open(self.save_path, "w") as file:
-            json.dump(save_json, file, indent = 4)
+        with self._save_condition:
+            if self._pending_json is None:
+                self._save_due = time.monotonic() + self.save_delay
+                self._save_condition.notify()
+
+            self._pending_json = save_json
+
+    def flush(self):
+        """
+        Writes a pending save immediately.
+        """
+        # Taking the snapshot under the write lock keeps an older snapshot from being written after a newer one
+        with self._write_lock:
+            with self._save_condition:
+                save_json = self._pending_json
+                self._pending_json = None
+
+            if save_json is None:
+                return
+
+            try:
+                self._write(save_json)
+            except OSError as e:
+                log.error(f"Failed to save asset overrides to {self.save_path}. Error: {e}")
+
+    def _work(self):
+        while True:
+            with self._save_condition:
+                while self._pending_json is None:
+                    self._save_condition.wait()
+
+                delay = self._save_due - time.monotonic()
+
+            # Saves until then are coalesced. The due time is checked again, a flush in between might have
+            # written that snapshot already and a newer save started its own delay.
+            if delay > 0:
+                time.sleep(delay)
+                continue
+
+            self.flush()
+
+    def _write(self, save_json: dict):
+        # Writes are serialized by the write lock, so a fixed temp path next to the file is enough
+        temp_path = self.save_path + ".tmp"
+
+        # Created like a plain open() would, then given the mode of the file it replaces
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+
+        try:
+            with os.fdopen(fd, "w") as file:
+                if os.path.exists(self.save_path):
+                    os.fchmod(file.fileno(), stat.S_IMODE(os.stat(self.save_path).st_mode))
+
+                json.dump(save_json, file, indent = 4)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.save_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
 
     def load(self):
         if not os.path.isfile(self.save_path):
@@ -41,25 +41,26 @@ class Manager:
         self._asset_overrides: dict[str, asset_type] = {}
         self._observer = Observer()
         self._json_key = json_key
+        self._versions: dict[str, int] = {}
 
     # Assets
 
     def add_asset(self, key: str, asset: Asset, override: bool = False):
         if not self._assets.__contains__(key) or override:
             self._assets[key] = asset
-            self._observer.notify(ManagerEvent.ADD, key, asset)
+            self._notify(ManagerEvent.ADD, key, asset)
 
     def remove_asset(self, key: str):
         if self._assets.__contains__(key):
             del self._assets[key]
-            self._observer.notify(ManagerEvent.REMOVE, key)
+            self._notify(ManagerEvent.REMOVE, key)
 
     def change_asset(self, key: str, *values):
         if self._assets.__contains__(key):
             asset = self.get_asset(key, skip_override=True)
             asset.change(*values)
             self._assets[key] = asset
-            self._observer.notify(ManagerEvent.CHANGE, key, asset, {values: values})
+            self._notify(ManagerEvent.CHANGE, key, asset, {values: values})
 
     # Overrides
 
@@ -69,19 +70,19 @@ class Manager:
 
         if not self._asset_overrides.__contains__(key) or override:
             self._asset_overrides[key] = asset
-            self._observer.notify(ManagerEvent.OVERRIDE_ADD, key, asset)
+            self._notify(ManagerEvent.OVERRIDE_ADD, key, asset)
 
     def remove_override(self, key: str):
         if self._asset_overrides.__contains__(key):
             del self._asset_overrides[key]
-            self._observer.notify(ManagerEvent.OVERRIDE_REMOVE, key)
+            self._notify(ManagerEvent.OVERRIDE_REMOVE, key)
 
     def change_override(self, key: str, *values):
         if self._asset_overrides.__contains__(key):
             override = self.get_asset(key)
             override.change(*values)
             self._asset_overrides[key] = override
-            self._observer.notify(ManagerEvent.OVERRIDE_CHANGE, key, override, {"values": values})
+            self._notify(ManagerEvent.OVERRIDE_CHANGE, key, override, {"values": values})
 
     # Getter
 
@@ -110,10 +111,25 @@ class Manager:
         combined = {**self._assets, **self._asset_overrides}
         return MappingProxyType(combined)
 
+    def get_version(self, key: str) -> int:
+        """
+        Counter that increases every time the asset or its override changes, used to tell if a render is outdated
+        """
+        return self._versions.get(key, 0)
+
     # Observer
 
-    def add_listener(self, callback: callable):
-        self._observer.subscribe(callback)
+    def _notify(self, event: ManagerEvent, key: str, *args):
+        self._versions[key] = self._versions.get(key, 0) + 1
+        self._observer.notify(event, key, *args)
+
+    def add_listener(self, callback: callable, keys: set[str] = None, events: set[ManagerEvent] = None):
+        """
+        Callbacks are called with (event, key, *values) and only for the keys and events they subscribed to
+        :param keys: Asset keys the callback is interested in, None for all of them
+        :param events: Events the callback is interested in, None for all of them
+        """
+        self._observer.subscribe(callback, keys, events)
 
     def remove_listener(self, callback: callable):
         self._observer.unsubscribe(callback)
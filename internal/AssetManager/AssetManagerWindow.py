@@ -4,7 +4,7 @@ Year: 2024
 """
 from src.backend.DeckManagement.ImageHelpers import image2pixbuf
 from .AssetDisplays import AssetManagerWindow, AssetPreview
-from .AssetManager import AssetManager, Icon, Color
+from .AssetManager import AssetManager, Icon, Color, render_cache
 
 import gi
 
@@ -31,6 +31,10 @@ class IconPreview(AssetPreview):
         new_width = int(original_width * scale)
         new_height = int(original_height * scale)
 
+        # Images coming from the render_cache are already fitted to the preview size
+        if (new_width, new_height) == (original_width, original_height):
+            return self.pixbuf
+
         return self.pixbuf.scale_simple(new_width, new_height, GdkPixbuf.InterpType.BILINEAR)
 
     def build(self):
@@ -93,6 +97,8 @@ class ColorPreview(AssetPreview):
         return rgba
 
 class Window(AssetManagerWindow):
+    PREVIEW_SIZE = (100, 100)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -127,10 +133,11 @@ class Window(AssetManagerWindow):
 
         if file:
             file_path = file.get_path()
+            # The file might have been edited since it was last decoded
+            render_cache.invalidate(file_path)
             self.asset_manager.icons.add_override(preview.name, Icon(path=file_path), override=True)
 
-            _, render = self.asset_manager.icons.get_asset_values(preview.name)
-            preview.set_image(render)
+            preview.set_image(self.asset_manager.get_icon_render(preview.name, size=preview.size))
             self.asset_manager.save()
 
     # Color
@@ -156,9 +163,9 @@ class Window(AssetManagerWindow):
         icons = self.asset_manager.icons.get_assets_merged()
 
         for name, icon in icons.items():
-            _, render = icon.get_values()
+            render = icon.get_scaled(self.PREVIEW_SIZE)
 
-            preview = IconPreview(window=self, name=name, image=render, size=(100, 100), vexpand=False, hexpand=False)
+            preview = IconPreview(window=self, name=name, image=render, size=self.PREVIEW_SIZE, vexpand=False, hexpand=False)
             flow_box.append(preview)
 
     def display_colors(self, flow_box):
@@ -173,8 +180,7 @@ class Window(AssetManagerWindow):
         preview = args[1]
         if type(preview) == IconPreview:
             self.asset_manager.icons.remove_override(preview.name)
-            _, render = self.asset_manager.icons.get_asset(preview.name).get_values()
-            preview.set_image(render)
+            preview.set_image(self.asset_manager.get_icon_render(preview.name, size=preview.size))
             self.asset_manager.save()
         elif type(preview) == ColorPreview:
             self.asset_manager.colors.remove_override(preview.name)
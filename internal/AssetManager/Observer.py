@@ -4,43 +4,130 @@ Year: 2024
 """
 
 import asyncio
+import threading
+import weakref
 from loguru import logger as log
 
+_loop: asyncio.AbstractEventLoop = None
+_loop_lock = threading.Lock()
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """
+    One loop for all observers, started the first time a coroutine callback has to run.
+    """
+    global _loop
+
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, daemon=True).start()
+        return _loop
+
 class Observer:
+    """
+    Sync callbacks are called inline on the notifying thread, coroutine callbacks are scheduled on a shared loop.
+    Bound methods are only referenced weakly, so they unsubscribe themselves once their object is gone.
+
+    Subscriptions are indexed by key, a notification only looks at the callbacks of its key and the ones
+    listening to every key, so the cost doesn't grow with listeners for unrelated keys.
+    """
+
     def __init__(self):
-        self.observers: list = []
+        self._lock = threading.Lock()
+        self.observers: dict = {}  # ref -> (keys or None, events or None)
+        self._index: dict = {}  # key or None for all keys -> {ref: events or None}
+        self._dead: list = []  # refs whose object got collected, removed on the next locked access
+
+    def subscribe(self, observer: callable, keys: set[str] = None, events: set = None):
+        """
+        :param keys: Only notify when the key (second notify argument) is one of these, None for every key
+        :param events: Only notify when the event (first notify argument) is one of these, None for every event
+        """
+        ref = self._make_ref(observer)
+        keys = frozenset(keys) if keys is not None else None
+        events = frozenset(events) if events is not None else None
 
-    def subscribe(self, observer: callable):
-        if observer not in self.observers:
-            self.observers.append(observer)
+        with self._lock:
+            self._prune()
+            self._remove(ref)
+            self.observers[ref] = (keys, events)
+
+            for key in keys if keys is not None else (None,):
+                self._index.setdefault(key, {})[ref] = events
 
     def unsubscribe(self, observer: callable):
-        if observer in self.observers:
-            self.observers.remove(observer)
+        with self._lock:
+            self._prune()
+            self._remove(self._make_ref(observer))
 
     def notify(self, *args, **kwargs):
+        event = args[0] if args else None
+        key = args[1] if len(args) > 1 else None
+
+        with self._lock:
+            self._prune()
+            callbacks = [ref() for index_key in {key, None} for ref, events in self._index.get(index_key, {}).items()
+                         if events is None or event in events]
+
+        for callback in callbacks:
+            if callback is not None:
+                self._call(callback, *args, **kwargs)
+
+    def _prune(self):
+        while self._dead:
+            self._remove(self._dead.pop())
+
+    def _remove(self, ref):
+        subscription = self.observers.pop(ref, None)
+
+        if subscription is None:
+            return
+
+        keys, _ = subscription
+        for key in keys if keys is not None else (None,):
+            refs = self._index.get(key)
+            if refs is not None:
+                refs.pop(ref, None)
+                if not refs:
+                    del self._index[key]
+
+    def _call(self, callback: callable, *args, **kwargs):
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.ensure_future(self._notify(*args, **kwargs))  # Schedule _notify as a coroutine
+            if asyncio.iscoroutinefunction(callback):
+                future = asyncio.run_coroutine_threadsafe(callback(*args, **kwargs), _get_loop())
+                future.add_done_callback(lambda f: self._log_exception(callback, f.exception()))
             else:
-                loop.run_until_complete(self._notify(*args, **kwargs))
-            return
-        except:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self._notify(*args, **kwargs))
-
-    async def _notify(self, *args, **kwargs):
-        coroutines = [self._ensure_coroutine(observer, *args, **kwargs) for observer in self.observers]
-        await asyncio.gather(*coroutines)
-
-    async def _ensure_coroutine(self, callback: callable, *args, **kwargs):
-        if asyncio.iscoroutinefunction(callback):
-            return await callback(*args, **kwargs)
-        else:
-            try:
-                return await asyncio.to_thread(callback, *args, **kwargs)
-            except Exception as e:
-                log.error(f"Callback {callback.__name__} in {self.event_id} could not be called")
-                return await asyncio.sleep(0)
\ No newline at end of file
+                callback(*args, **kwargs)
+        except Exception as e:
+            self._log_exception(callback, e)
+
+    def _make_ref(self, observer: callable):
+        if hasattr(observer, "__self__"):
+            return weakref.WeakMethod(observer, self._on_observer_dead)
+        return _StrongRef(observer)
+
+    def _on_observer_dead(self, ref):
+        # Garbage collection can run this on a thread that holds the lock already, so it only queues the ref
+        self._dead.append(ref)
+
+    @staticmethod
+    def _log_exception(callback: callable, error: BaseException | None):
+        if error is not None:
+            log.error(f"Callback {getattr(callback, '__name__', callback)} could not be called. Error: {error}")
+
+class _StrongRef:
+    """
+    Same interface as a weakref for plain functions, which would otherwise die right away if they are lambdas.
+    """
+
+    def __init__(self, callback: callable):
+        self._callback = callback
+
+    def __call__(self):
+        return self._callback
+
+    def __eq__(self, other):
+        return isinstance(other, _StrongRef) and other._callback == self._callback
+
+    def __hash__(self):
+        return hash(self._callback)
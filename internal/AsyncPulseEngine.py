@@ -0,0 +1,166 @@
+import asyncio
+import concurrent.futures
+
+import pulsectl
+from loguru import logger as log
+
+from ..internal.DeviceEventRouter import DeviceEventRouter
+from ..internal.DeviceRegistry import DeviceRegistry
+from ..internal.PulseHelpers import DeviceFilter
+
+try:
+    import pulsectl_asyncio
+except ImportError:
+    pulsectl_asyncio = None
+
+
+class AsyncPulseEngine:
+    """
+    Owns one pulsectl_asyncio connection on the event router's loop. The event stream, the registry refreshes
+    it causes and the commands sent through it all run on that loop, so delivering an event to the actions
+    doesn't hop threads and doesn't need a second connection.
+
+    pulsectl_asyncio is optional, is_available() tells if the threaded PulseEvent listener has to be used instead.
+    """
+
+    def __init__(self, registry: DeviceRegistry, router: DeviceEventRouter, masks: tuple[str, ...],
+                 client_name: str = "audio-control-engine", reconnect_delay: float = 1.0):
+        self.registry = registry
+        self.router = router
+        self.masks = masks
+        self.client_name = client_name
+        self.reconnect_delay = reconnect_delay
+
+        self.loop: asyncio.AbstractEventLoop = router.loop
+        self.event_holder = None
+
+        self._pulse = None
+        self._connected: asyncio.Event = None
+        self._task: concurrent.futures.Future = None
+
+    @staticmethod
+    def is_available() -> bool:
+        return pulsectl_asyncio is not None
+
+    def start(self, event_holder=None):
+        """
+        :param event_holder: Event holder that still gets every event for listeners outside of this plugin
+        """
+        self.event_holder = event_holder
+        self._task = asyncio.run_coroutine_threadsafe(self._run(), self.loop)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    def run(self, coroutine) -> concurrent.futures.Future:
+        """
+        Schedules a coroutine of this engine from any thread.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    #
+    # CONNECTION
+    #
+
+    async def _run(self):
+        self._connected = asyncio.Event()
+
+        while True:
+            try:
+                async with pulsectl_asyncio.PulseAsync(self.client_name) as pulse:
+                    self._pulse = pulse
+                    self._connected.set()
+
+                    # Events might have been missed while disconnected
+                    await self._resync()
+
+                    async for event in pulse.subscribe_events(*self.masks):
+                        await self._on_event(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"Async pulse engine lost its connection, reconnecting. Error: {e}")
+            finally:
+                self._connected.clear()
+                self._pulse = None
+                # Nothing keeps the registry up to date until the resync after reconnecting
+                self.registry.invalidate()
+
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _get_pulse(self):
+        if self._connected is None:
+            raise pulsectl.PulseDisconnected("Engine not started")
+
+        await self._connected.wait()
+        return self._pulse
+
+    async def _resync(self):
+        pulse = self._pulse
+        changed = self.registry.apply_snapshot(await pulse.server_info(), await pulse.sink_list(), await pulse.source_list())
+
+        for device_filter in changed:
+            self.router.dispatch_standard_change(None, device_filter)
+
+    #
+    # EVENTS
+    #
+
+    async def _on_event(self, event):
+        device_filter = self.registry.get_event_filter(event)
+
+        try:
+            if device_filter is not None:
+                pulse_device_name = await self._apply_device_event(device_filter, event)
+                self.router.dispatch(event, device_filter, pulse_device_name)
+            elif event.facility == "server":
+                server_info = await self._pulse.server_info()
+                for changed_filter in self.registry.apply_server_info(server_info):
+                    self.router.dispatch_standard_change(event, changed_filter)
+        except pulsectl.PulseDisconnected:
+            raise
+        except Exception as e:
+            log.error(f"Error while handling pulse event {event}. Error: {e}")
+
+        if self.event_holder is not None:
+            self.event_holder.trigger_event(event)
+
+    async def _apply_device_event(self, device_filter: DeviceFilter, event) -> str | None:
+        if event.t == "remove":
+            return self.registry.apply_removed(device_filter, event.index)
+
+        try:
+            if device_filter == DeviceFilter.SINK:
+                device = await self._pulse.sink_info(event.index)
+            else:
+                device = await self._pulse.source_info(event.index)
+        except pulsectl.PulseIndexError:
+            return self.registry.apply_removed(device_filter, event.index)
+
+        return self.registry.apply_device(device_filter, device)
+
+    #
+    # COMMANDS
+    #
+
+    async def change_volume(self, device, adjust: int, upper_bound: int = 100):
+        pulse = await self._get_pulse()
+
+        # Same clamping as the NativeVolumeBackend
+        current = max(device.volume.values)
+        target = current + adjust * 0.01
+
+        if adjust > 0:
+            target = min(target, upper_bound * 0.01)
+        target = max(target, 0)
+
+        await pulse.volume_change_all_chans(device, target - current)
+
+    async def set_volume(self, device, volume: int):
+        pulse = await self._get_pulse()
+        await pulse.volume_set_all_chans(device, volume * 0.01)
+
+    async def mute(self, device, state: bool):
+        pulse = await self._get_pulse()
+        await pulse.mute(device, state)
@@ -0,0 +1,84 @@
+import threading
+from collections import deque
+
+from loguru import logger as log
+
+
+class CommandExecutor:
+    """
+    Runs blocking Pulse commands on a single worker thread so the deck input path never waits on the server.
+
+    Commands are queued per key (usually the device) and run in submission order for that key. Keys are served
+    round-robin, so a busy device can't starve the others. Each key holds at most max_pending commands, further
+    submissions are rejected until the worker caught up.
+    """
+
+    def __init__(self, max_pending: int = 8):
+        self.max_pending = max_pending
+
+        self._condition = threading.Condition()
+        self._queues: dict[object, deque] = {}
+        self._ready: deque = deque()
+        self._running: bool = True
+
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def submit(self, key, command: callable, on_done: callable = None) -> bool:
+        """
+        Queues a command.
+        :param key: Commands with the same key are executed in order
+        :param on_done: Called with (result, error) on the worker thread once the command ran
+        :return: False if the queue for key is full and the command was rejected
+        """
+        with self._condition:
+            queue = self._queues.setdefault(key, deque())
+
+            if len(queue) >= self.max_pending:
+                return False
+
+            queue.append((command, on_done))
+            if len(queue) == 1:
+                self._ready.append(key)
+
+            self._condition.notify()
+            return True
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while self._running and not self._ready:
+                    self._condition.wait()
+
+                if not self._running:
+                    return
+
+                key = self._ready.popleft()
+                command, on_done = self._queues[key][0]
+
+            result, error = None, None
+            try:
+                result = command()
+            except Exception as e:
+                error = e
+                log.error(f"Error while executing command for {key}. Error: {e}")
+
+            with self._condition:
+                queue = self._queues[key]
+                queue.popleft()
+
+                if queue:
+                    self._ready.append(key)
+                else:
+                    del self._queues[key]
+
+            if on_done is not None:
+                try:
+                    on_done(result, error)
+                except Exception as e:
+                    log.error(f"Error in completion callback for {key}. Error: {e}")
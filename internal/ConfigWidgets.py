@@ -0,0 +1,56 @@
+"""
+Everything only the configuration areas need. Actions and settings import from here inside their UI methods,
+so none of it is loaded before a configuration area is opened.
+"""
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from gi.repository import GObject
+
+from GtkHelper.GtkHelper import ScaleRow, BetterExpander
+from GtkHelper.SearchComboRow import SearchComboRow, SearchComboRowItem
+
+from ..internal.AdwGrid import AdwGrid
+from ..internal.AssetManager.AssetManagerWindow import Window
+
+
+class DeviceFilterItem(SearchComboRowItem):
+    def __init__(self, display_label, filter: "DeviceFilter"):
+        super().__init__(display_label)
+        self._pulse_filter = filter
+
+    @GObject.Property
+    def pulse_filter(self):
+        return self._pulse_filter
+
+
+class InfoContentItem(SearchComboRowItem):
+    def __init__(self, display_label, info_content: "InfoContent"):
+        super().__init__(display_label)
+        self._info_content = info_content
+
+    @GObject.Property
+    def info_content(self):
+        return self._info_content
+
+
+class BehaviourItems(SearchComboRowItem):
+    def __init__(self, display_label, behaviour):
+        super().__init__(display_label)
+        self._behaviour = behaviour
+
+    @GObject.Property
+    def behaviour(self):
+        return self._behaviour
+
+
+class VolumeBackendItem(SearchComboRowItem):
+    def __init__(self, display_label, backend_type: "VolumeBackendType"):
+        super().__init__(display_label)
+        self._backend_type = backend_type
+
+    @GObject.Property
+    def backend_type(self):
+        return self._backend_type
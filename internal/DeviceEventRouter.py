@@ -0,0 +1,179 @@
+import asyncio
+import threading
+import weakref
+
+from loguru import logger as log
+
+from ..internal.PulseHelpers import DeviceFilter
+
+
+class DeviceEventRouter:
+    """
+    Routes Pulse events only to the actions subscribed to the device the event is for.
+
+    Events are collected for one frame and every (facility, index) pair is delivered once per frame
+    with its latest event, so a volume ramp on one device results in one notification per frame.
+    Subscribing with no device name follows the current standard device of the filter.
+    """
+
+    def __init__(self, registry: "DeviceRegistry", event_id: str, frame_time: float = 1 / 60):
+        self.registry = registry
+        self.event_id = event_id
+        self.frame_time = frame_time
+
+        self._lock = threading.Lock()
+        self._subscriptions: dict[weakref.WeakMethod, tuple[DeviceFilter, str | None]] = {}
+        self._by_device: dict[tuple[DeviceFilter, str | None], set[weakref.WeakMethod]] = {}
+        self._dead: list[weakref.WeakMethod] = []  # refs whose object got collected, removed on the next locked access
+
+        self._pending: dict[tuple[DeviceFilter, int], tuple[object, str | None]] = {}
+        self._pending_standard: dict[DeviceFilter, object] = {}
+        self._flush_handle: asyncio.TimerHandle = None
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    #
+    # SUBSCRIPTIONS
+    #
+
+    def subscribe(self, callback: callable, device_filter: DeviceFilter, pulse_device_name: str | None = None):
+        """
+        (Re-)subscribes a bound method to a device. A callback is only ever subscribed to one device.
+        :param pulse_device_name: The device to listen to, None follows the standard device
+        """
+        ref = weakref.WeakMethod(callback, self._on_callback_dead)
+        key = (device_filter, pulse_device_name)
+
+        with self._lock:
+            self._prune()
+            self._remove(ref)
+            self._subscriptions[ref] = key
+            self._by_device.setdefault(key, set()).add(ref)
+
+    def unsubscribe(self, callback: callable):
+        with self._lock:
+            self._prune()
+            self._remove(weakref.WeakMethod(callback))
+
+    def _prune(self):
+        while self._dead:
+            self._remove(self._dead.pop())
+
+    def _remove(self, ref: weakref.WeakMethod):
+        key = self._subscriptions.pop(ref, None)
+
+        if key is None:
+            return
+
+        refs = self._by_device.get(key)
+        if refs is not None:
+            refs.discard(ref)
+            if not refs:
+                del self._by_device[key]
+
+    def _on_callback_dead(self, ref: weakref.WeakMethod):
+        # Garbage collection can run this on a thread that holds the lock already, so it only queues the ref
+        self._dead.append(ref)
+
+    #
+    # DISPATCH
+    #
+
+    def post(self, event, device_filter: DeviceFilter, pulse_device_name: str | None):
+        """
+        Thread safe entry point for the event listener.
+        """
+        self.loop.call_soon_threadsafe(self.dispatch, event, device_filter, pulse_device_name)
+
+    def post_standard_change(self, event, device_filter: DeviceFilter):
+        """
+        Thread safe, notifies everyone following the standard device of the filter that it changed.
+        """
+        self.loop.call_soon_threadsafe(self.dispatch_standard_change, event, device_filter)
+
+    def post_resync(self):
+        """
+        Thread safe, notifies every subscriber once, e.g. after events got lost.
+        """
+        self.loop.call_soon_threadsafe(self._resync)
+
+    def _resync(self):
+        with self._lock:
+            self._prune()
+            refs = list(self._subscriptions)
+
+        for callback in (ref() for ref in refs):
+            if callback is not None:
+                self.loop.create_task(self._call(callback, None))
+
+    def dispatch(self, event, device_filter: DeviceFilter, pulse_device_name: str | None):
+        """
+        Same as post, but has to be called on self.loop. Used by code already running there, like the async engine.
+        """
+        self._pending[(device_filter, event.index)] = (event, pulse_device_name)
+        self._schedule_flush()
+
+    def dispatch_standard_change(self, event, device_filter: DeviceFilter):
+        """
+        Same as post_standard_change, but has to be called on self.loop.
+        """
+        self._pending_standard[device_filter] = event
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flush_handle is None:
+            self._flush_handle = self.loop.call_later(self.frame_time, self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        pending_standard, self._pending_standard = self._pending_standard, {}
+
+        delivered: set[tuple[DeviceFilter, object]] = set()
+
+        for device_filter, event in pending_standard.items():
+            for callback in self._standard_targets(device_filter):
+                delivered.add((device_filter, callback))
+                self.loop.create_task(self._call(callback, event))
+
+        for (device_filter, _), (event, pulse_device_name) in pending.items():
+            if pulse_device_name is None:
+                continue
+
+            targets = self._targets(device_filter, pulse_device_name, self.registry.get_default_name(device_filter))
+
+            for callback in targets:
+                # Standard followers already re-read their new device this frame
+                if (device_filter, callback) in delivered:
+                    continue
+                self.loop.create_task(self._call(callback, event))
+
+    def _targets(self, device_filter: DeviceFilter, pulse_device_name: str, standard_name: str | None) -> list:
+        with self._lock:
+            self._prune()
+            refs = set(self._by_device.get((device_filter, pulse_device_name), ()))
+
+            if pulse_device_name == standard_name:
+                refs.update(self._by_device.get((device_filter, None), ()))
+
+        callbacks = (ref() for ref in refs)
+        return [callback for callback in callbacks if callback is not None]
+
+    def _standard_targets(self, device_filter: DeviceFilter) -> list:
+        with self._lock:
+            self._prune()
+            refs = list(self._by_device.get((device_filter, None), ()))
+
+        callbacks = (ref() for ref in refs)
+        return [callback for callback in callbacks if callback is not None]
+
+    async def _call(self, callback: callable, event):
+        try:
+            if asyncio.iscoroutinefunction(callback):
+                await callback(self.event_id, event)
+            else:
+                callback(self.event_id, event)
+        except Exception as e:
+            log.error(f"Error while delivering pulse event to {callback}. Error: {e}")
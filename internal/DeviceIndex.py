@@ -0,0 +1,127 @@
+from ..internal.PulseHelpers import filter_proplist
+
+
+class DeviceIndex:
+    """
+    Bidirectional index over the devices of one filter: pulse index <-> pulse name <-> display name.
+
+    Monitor devices are kept in their own partition and are never returned for a display name,
+    which matches what the device dropdowns show. Not thread safe, the DeviceRegistry guards it.
+    """
+
+    def __init__(self):
+        self._devices: dict[int, object] = {}
+        self._indices: dict[str, int] = {}  # Pulse name -> index
+        self._display_names: dict[int, str] = {}  # Index -> display name
+        self._by_display_name: dict[str, int] = {}  # Display name -> lowest non monitor index
+        self._monitors: set[int] = set()
+        self.version: int = 0  # Increases whenever get_display_names() would return something else
+
+    def clear(self):
+        self._devices.clear()
+        self._indices.clear()
+        self._display_names.clear()
+        self._by_display_name.clear()
+        self._monitors.clear()
+        self.version += 1
+
+    #
+    # UPDATES
+    #
+
+    def store(self, device):
+        display_name = filter_proplist(device.proplist)
+
+        if device.index in self._devices:
+            # Volume and mute changes don't touch the listing, so they keep the version
+            if (self._display_names[device.index], device.index in self._monitors) != (display_name, self.is_monitor(device)):
+                self.version += 1
+            self._unlink(device.index)
+        else:
+            self.version += 1
+
+        self._devices[device.index] = device
+        self._indices[device.name] = device.index
+        self._display_names[device.index] = display_name
+
+        if self.is_monitor(device):
+            self._monitors.add(device.index)
+            return
+
+        if display_name is None:
+            return
+
+        current = self._by_display_name.get(display_name)
+        if current is None or device.index < current:
+            self._by_display_name[display_name] = device.index
+
+    def remove(self, index: int):
+        device = self._unlink(index)
+
+        if device is not None:
+            self.version += 1
+        return device
+
+    def _unlink(self, index: int):
+        device = self._devices.pop(index, None)
+
+        if device is None:
+            return None
+
+        display_name = self._display_names.pop(index, None)
+        self._monitors.discard(index)
+
+        if self._indices.get(device.name) == index:
+            del self._indices[device.name]
+
+        if display_name is not None and self._by_display_name.get(display_name) == index:
+            self._reindex_display_name(display_name)
+
+        return device
+
+    def _reindex_display_name(self, display_name: str):
+        """
+        Points a display name at the lowest indexed non monitor device carrying it, like a linear scan over the device list would.
+        """
+        indices = [index for index, name in self._display_names.items()
+                   if name == display_name and index not in self._monitors]
+
+        if indices:
+            self._by_display_name[display_name] = min(indices)
+        else:
+            self._by_display_name.pop(display_name, None)
+
+    @staticmethod
+    def is_monitor(device) -> bool:
+        return device.description.__contains__("Monitor")
+
+    #
+    # GETTER
+    #
+
+    def get(self, index: int):
+        return self._devices.get(index)
+
+    def get_by_name(self, pulse_device_name: str):
+        return self._devices.get(self._indices.get(pulse_device_name))
+
+    def get_by_display_name(self, display_name: str):
+        return self._devices.get(self._by_display_name.get(display_name))
+
+    def get_display_name(self, pulse_device_name: str) -> str | None:
+        return self._display_names.get(self._indices.get(pulse_device_name))
+
+    def get_pulse_name(self, display_name: str) -> str | None:
+        device = self.get_by_display_name(display_name)
+        return device.name if device is not None else None
+
+    def get_devices(self, include_monitors: bool = True) -> list:
+        return [device for index, device in sorted(self._devices.items())
+                if include_monitors or index not in self._monitors]
+
+    def get_display_names(self) -> list[str]:
+        """
+        Display names of all non monitor devices in index order.
+        """
+        return [self._display_names[index] for index in sorted(self._devices)
+                if index not in self._monitors and self._display_names[index] is not None]
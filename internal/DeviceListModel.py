@@ -0,0 +1,74 @@
+import difflib
+import threading
+
+from ..internal.AssetManager.Observer import Observer
+from ..internal.DeviceRegistry import DeviceRegistry
+from ..internal.PulseHelpers import DeviceFilter, get_device_display_names
+
+
+class DeviceListModel:
+    """
+    Items of the device dropdowns, shared by all actions and kept in sync with the DeviceRegistry.
+
+    When the registry reports a changed listing only the rows that were added or removed are touched,
+    every other SearchComboRowItem is reused, so opening a configuration never queries the server.
+    """
+
+    def __init__(self, registry: DeviceRegistry):
+        self.registry = registry
+
+        self._lock = threading.Lock()
+        self._items: dict[DeviceFilter, list["SearchComboRowItem"]] = {}
+        self._versions: dict[DeviceFilter, int] = {}
+        self._observer = Observer()
+
+        self.registry.add_listing_listener(self.on_listing_changed)
+
+    def get_items(self, device_filter: DeviceFilter) -> list["SearchComboRowItem"]:
+        # Without a snapshot there are no events telling when a cached list got stale
+        if not self.registry.populated:
+            return self._create_items(get_device_display_names(device_filter))
+
+        with self._lock:
+            if self._versions.get(device_filter) != self.registry.get_listing_version(device_filter):
+                self._sync(device_filter)
+            return list(self._items[device_filter])
+
+    def add_listener(self, callback: callable):
+        """
+        :param callback: Called with ("listing", device_filter) after the items of a filter changed
+        """
+        self._observer.subscribe(callback)
+
+    def remove_listener(self, callback: callable):
+        self._observer.unsubscribe(callback)
+
+    def on_listing_changed(self, event, device_filter: DeviceFilter):
+        with self._lock:
+            # Nobody asked for this filter yet, it is built on first use
+            if device_filter not in self._items:
+                return
+            self._sync(device_filter)
+
+        self._observer.notify("listing", device_filter)
+
+    def _sync(self, device_filter: DeviceFilter):
+        version = self.registry.get_listing_version(device_filter)
+        names = self.registry.get_display_names(device_filter)
+        items = self._items.setdefault(device_filter, [])
+
+        matcher = difflib.SequenceMatcher(a=[item.display_label for item in items], b=names, autojunk=False)
+
+        # Applied back to front so the positions of earlier opcodes stay valid
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if tag == "equal":
+                continue
+            items[i1:i2] = self._create_items(names[j1:j2])
+
+        self._versions[device_filter] = version
+
+    def _create_items(self, names: list[str]) -> list["SearchComboRowItem"]:
+        # Items are only ever needed once a configuration area is open
+        from ..internal.ConfigWidgets import SearchComboRowItem
+
+        return [SearchComboRowItem(display_label=name) for name in names]
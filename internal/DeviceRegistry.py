@@ -0,0 +1,239 @@
+import threading
+
+import pulsectl
+from loguru import logger as log
+
+from ..internal.PulseConnectionPool import PulseConnectionPool
+from ..internal.DeviceIndex import DeviceIndex
+from ..internal.PulseHelpers import DeviceFilter
+from ..internal.AssetManager.Observer import Observer
+
+
+class DeviceRegistry:
+    """
+    In-memory copy of all sinks and sources on the server.
+
+    It is filled once with a full snapshot and afterwards only updated for the single device a
+    new/change/remove event points at, so actions can read device state without any IPC.
+    Listing listeners are called with ("listing", device_filter) whenever devices of a filter got added, removed
+    or renamed, plain volume/mute changes don't trigger them.
+    """
+
+    def __init__(self, pool: PulseConnectionPool):
+        self.pool = pool
+        self.populated: bool = False
+
+        self._lock = threading.RLock()
+        self._indexes: dict[DeviceFilter, DeviceIndex] = {DeviceFilter.SINK: DeviceIndex(), DeviceFilter.SOURCE: DeviceIndex()}
+        self._default_names: dict[DeviceFilter, str] = {DeviceFilter.SINK: None, DeviceFilter.SOURCE: None}
+        self._default_names_valid: bool = False
+        self._listing_observer = Observer()
+
+    #
+    # UPDATES
+    #
+
+    def populate(self) -> bool:
+        def _snapshot(pulse: pulsectl.Pulse):
+            return pulse.server_info(), pulse.sink_list(), pulse.source_list()
+
+        try:
+            server_info, sinks, sources = self.pool.run(_snapshot)
+        except Exception as e:
+            log.error(f"Error while populating device registry. Error: {e}")
+            return False
+
+        self.apply_snapshot(server_info, sinks, sources)
+        return True
+
+    def apply_snapshot(self, server_info, sinks: list, sources: list) -> list[DeviceFilter]:
+        """
+        Replaces everything with a full snapshot fetched by the caller.
+        :return: The filters whose standard device changed
+        """
+        with self._lock:
+            for device_filter, devices in ((DeviceFilter.SINK, sinks), (DeviceFilter.SOURCE, sources)):
+                self._indexes[device_filter].clear()
+
+                for device in devices:
+                    self._indexes[device_filter].store(device)
+
+            changed = self.apply_server_info(server_info)
+            self.populated = True
+
+        for device_filter in self._indexes:
+            self._notify_listing(device_filter)
+
+        return changed
+
+    def invalidate(self):
+        """
+        Called when events can't be received anymore, helpers query the server again until the next populate()
+        """
+        with self._lock:
+            self.populated = False
+
+    def handle_event(self, event) -> str | None:
+        """
+        Applies a pulsectl event to the registry.
+        :return: The pulse name of the device the event was for, or None if it is not a sink/source event
+        """
+        device_filter = self.get_event_filter(event)
+
+        if device_filter is None:
+            return None
+
+        if event.t == "remove":
+            return self.apply_removed(device_filter, event.index)
+        return self._refresh(device_filter, event.index)
+
+    def handle_server_event(self, event) -> list[DeviceFilter]:
+        """
+        Server events are the only thing that can change the standard devices, so the cached names are only refreshed here.
+        :return: The filters whose standard device changed
+        """
+        if event.facility != "server":
+            return []
+
+        with self._lock:
+            self._default_names_valid = False
+        return self.refresh_default_names()
+
+    def refresh_default_names(self) -> list[DeviceFilter]:
+        try:
+            server_info = self.pool.run(lambda pulse: pulse.server_info())
+        except Exception as e:
+            log.error(f"Error while refreshing standard devices. Error: {e}")
+            return []
+
+        return self.apply_server_info(server_info)
+
+    def apply_server_info(self, server_info) -> list[DeviceFilter]:
+        """
+        Stores the standard devices of a server_info fetched by the caller.
+        :return: The filters whose standard device changed
+        """
+        names = {
+            DeviceFilter.SINK: server_info.default_sink_name,
+            DeviceFilter.SOURCE: server_info.default_source_name
+        }
+
+        with self._lock:
+            changed = [device_filter for device_filter, name in names.items() if self._default_names[device_filter] != name]
+            self._default_names.update(names)
+            self._default_names_valid = True
+
+        return changed
+
+    def _refresh(self, device_filter: DeviceFilter, index: int) -> str | None:
+        def _fetch(pulse: pulsectl.Pulse):
+            if device_filter == DeviceFilter.SINK:
+                return pulse.sink_info(index)
+            return pulse.source_info(index)
+
+        try:
+            device = self.pool.run(_fetch)
+        except pulsectl.PulseIndexError:
+            return self.apply_removed(device_filter, index)
+        except Exception as e:
+            log.error(f"Error while refreshing device {index} with filter: {device_filter}. Error: {e}")
+            return None
+
+        return self.apply_device(device_filter, device)
+
+    def apply_device(self, device_filter: DeviceFilter, device) -> str:
+        """
+        Stores a device info fetched by the caller, used by the sync path as well as the async engine.
+        """
+        with self._lock:
+            version = self._indexes[device_filter].version
+            self._indexes[device_filter].store(device)
+            listing_changed = version != self._indexes[device_filter].version
+
+        if listing_changed:
+            self._notify_listing(device_filter)
+
+        return device.name
+
+    def apply_removed(self, device_filter: DeviceFilter, index: int) -> str | None:
+        with self._lock:
+            device = self._indexes[device_filter].remove(index)
+
+        if device is None:
+            return None
+
+        self._notify_listing(device_filter)
+        return device.name
+
+    def _notify_listing(self, device_filter: DeviceFilter):
+        self._listing_observer.notify("listing", device_filter)
+
+    def add_listing_listener(self, callback: callable):
+        """
+        :param callback: Called with ("listing", device_filter) on the thread that applied the change
+        """
+        self._listing_observer.subscribe(callback)
+
+    def get_event_filter(self, event) -> DeviceFilter | None:
+        if event.facility == "sink":
+            return DeviceFilter.SINK
+        elif event.facility == "source":
+            return DeviceFilter.SOURCE
+        return None
+
+    #
+    # GETTER
+    #
+
+    def get_device(self, device_filter: DeviceFilter, pulse_device_name: str):
+        with self._lock:
+            return self._indexes[device_filter].get_by_name(pulse_device_name)
+
+    def get_device_by_index(self, device_filter: DeviceFilter, index: int):
+        with self._lock:
+            return self._indexes[device_filter].get(index)
+
+    def get_devices(self, device_filter: DeviceFilter, include_monitors: bool = True) -> list:
+        with self._lock:
+            return self._indexes[device_filter].get_devices(include_monitors)
+
+    def get_default_name(self, device_filter: DeviceFilter) -> str | None:
+        with self._lock:
+            if self._default_names_valid:
+                return self._default_names.get(device_filter)
+
+        # Only reached if refreshing after a server event failed
+        self.refresh_default_names()
+
+        with self._lock:
+            return self._default_names.get(device_filter)
+
+    def get_standard_device(self, device_filter: DeviceFilter):
+        return self.get_device(device_filter, self.get_default_name(device_filter))
+
+    def get_display_name(self, device_filter: DeviceFilter, pulse_device_name: str) -> str | None:
+        with self._lock:
+            return self._indexes[device_filter].get_display_name(pulse_device_name)
+
+    def get_display_names(self, device_filter: DeviceFilter) -> list[str]:
+        with self._lock:
+            return self._indexes[device_filter].get_display_names()
+
+    def get_listing_version(self, device_filter: DeviceFilter) -> int:
+        with self._lock:
+            return self._indexes[device_filter].version
+
+    def get_device_by_display_name(self, device_filter: DeviceFilter, display_name: str):
+        with self._lock:
+            return self._indexes[device_filter].get_by_display_name(display_name)
+
+    def get_pulse_name(self, device_filter: DeviceFilter, display_name: str) -> str | None:
+        with self._lock:
+            return self._indexes[device_filter].get_pulse_name(display_name)
+
+    def get_volumes(self, device_filter: DeviceFilter, pulse_device_name: str) -> list[int]:
+        device = self.get_device(device_filter, pulse_device_name)
+
+        if device is None:
+            return []
+        return [round(vol * 100) for vol in device.volume.values]
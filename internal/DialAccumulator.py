@@ -0,0 +1,101 @@
+import threading
+import time
+
+
+class DialAccumulator:
+    """
+    Sums up dial detents over a short window and applies them as a single relative change per window.
+
+    The target is tracked optimistically, so every detent of a fast spin moves the displayed value right away
+    while the server only sees the latest target. Each change is measured from the last target that was applied,
+    never from cached device state, so it stays correct no matter which backend sends it.
+    """
+
+    def __init__(self, apply: callable, window: float = 0.025, resync_after: float = 0.5):
+        """
+        :param apply: Called with the relative change from the worker thread, returns False if it failed
+        :param window: Seconds detents get collected before a change is applied
+        :param resync_after: Seconds of inactivity after which the next turn starts from the real device volume again
+        """
+        self.apply = apply
+        self.window = window
+        self.resync_after = resync_after
+
+        self._condition = threading.Condition()
+        self._target: int | None = None
+        self._applied: int | None = None  # Volume the device got set to by the last applied change
+        self._busy: bool = False  # A target is waiting for its window or being applied
+        self._stale: bool = False  # A change failed, the device volume is unknown
+        self._window_end: float = 0
+        self._last_applied: float = 0
+
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def add(self, delta: int, get_current_volume: callable, upper_bound: int = 100) -> int | None:
+        """
+        Adds a relative change to the pending target.
+        :param get_current_volume: Returns the current device volume, only called when starting a new turn
+        :return: The optimistic target volume or None if the current volume could not be determined
+        """
+        with self._condition:
+            if self._target is None or (not self._busy and (self._stale or time.monotonic() - self._last_applied > self.resync_after)):
+                base = get_current_volume()
+
+                if base is None:
+                    return None
+
+                self._target = self._applied = base
+                self._stale = False
+
+            target = self._target + delta
+
+            # Same behaviour as change_volume: raising never goes past the upper bound, lowering is never clamped
+            if delta > 0:
+                target = min(target, upper_bound)
+            self._target = int(max(0, target))
+
+            if not self._busy:
+                self._busy = True
+                self._window_end = time.monotonic() + self.window
+                self._condition.notify()
+
+            return self._target
+
+    def get_target(self) -> int | None:
+        """
+        The value that is about to be applied, None when the dial is idle.
+        """
+        with self._condition:
+            return self._target if self._busy else None
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._busy:
+                    self._condition.wait()
+
+                delay = self._window_end - time.monotonic()
+
+            if delay > 0:
+                time.sleep(delay)
+
+            self._flush()
+
+    def _flush(self):
+        while True:
+            with self._condition:
+                target, applied = self._target, self._applied
+
+                if target == applied:
+                    self._busy = False
+                    self._last_applied = time.monotonic()
+                    return
+
+            # Only the latest target is applied, everything in between is stale by now
+            if self.apply(target - applied) is False:
+                with self._condition:
+                    self._stale = True
+
+            with self._condition:
+                self._applied = target
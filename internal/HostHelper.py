@@ -0,0 +1,129 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import Future, InvalidStateError
+
+from loguru import logger as log
+
+HELPER_SCRIPT = os.path.join("internal", "pulse-host-helper.py")
+
+
+def is_flatpak() -> bool:
+    return os.path.exists("/.flatpak-info")
+
+
+def default_helper_command(stand_in: bool = False) -> list[str]:
+    # GlobalHelpers pulls in StreamController, the client itself works without it
+    from ..internal import GlobalHelpers
+
+    if is_flatpak():
+        command = ["flatpak-spawn", "--host", f"--directory={GlobalHelpers.plugin_base_dir()}", "python3", HELPER_SCRIPT]
+    else:
+        command = [sys.executable, os.path.join(GlobalHelpers.plugin_base_dir(), HELPER_SCRIPT)]
+
+    if stand_in:
+        command.append("--stand-in")
+    return command
+
+
+class HostHelperClient:
+    """
+    Keeps one pulse-host-helper.py process alive and multiplexes requests over its stdin/stdout pipe.
+    Every request gets an id, responses are matched back to the Future returned by request().
+    """
+
+    def __init__(self, command: list[str] = None):
+        self.command = command or default_helper_command()
+
+        self._process: subprocess.Popen = None
+        self._reader: threading.Thread = None
+        self._lock = threading.Lock()
+        self._pending: dict[int, Future] = {}
+        self._next_id: int = 0
+
+    def request(self, cmd: str, **kwargs) -> Future:
+        future = Future()
+
+        with self._lock:
+            self._ensure_running()
+
+            self._next_id += 1
+            request_id = self._next_id
+            self._pending[request_id] = future
+
+            try:
+                self._process.stdin.write(json.dumps({"id": request_id, "cmd": cmd, **kwargs}) + "\n")
+                self._process.stdin.flush()
+            except Exception as e:
+                del self._pending[request_id]
+                future.set_exception(e)
+
+        return future
+
+    def stop(self):
+        with self._lock:
+            process, self._process = self._process, None
+            # Nobody is going to answer them anymore
+            self._fail_pending(RuntimeError("Host helper stopped"))
+
+        if process is None:
+            return
+
+        try:
+            process.stdin.close()
+            process.wait(timeout=1)
+        except Exception:
+            process.kill()
+
+    #
+    # PROCESS
+    #
+
+    def _ensure_running(self):
+        if self._process is not None and self._process.poll() is None:
+            return
+
+        self._fail_pending(RuntimeError("Host helper exited"))
+
+        self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         text=True, bufsize=1)
+        self._reader = threading.Thread(target=self._read_loop, args=(self._process,), daemon=True)
+        self._reader.start()
+
+    def _read_loop(self, process: subprocess.Popen):
+        for line in process.stdout:
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                log.warning(f"Host helper sent invalid response: {line.strip()}")
+                continue
+
+            with self._lock:
+                future = self._pending.pop(response.get("id"), None)
+
+            if future is None:
+                continue
+
+            try:
+                if response.get("ok"):
+                    future.set_result(response.get("result"))
+                else:
+                    future.set_exception(RuntimeError(response.get("error", "Unknown host helper error")))
+            except InvalidStateError:
+                # The caller stopped waiting and cancelled it
+                pass
+
+        with self._lock:
+            if self._process is process:
+                self._fail_pending(RuntimeError("Host helper exited"))
+
+    def _fail_pending(self, error: Exception):
+        pending, self._pending = self._pending, {}
+
+        for future in pending.values():
+            try:
+                future.set_exception(error)
+            except InvalidStateError:
+                pass
@@ -0,0 +1,72 @@
+import threading
+import time
+
+from loguru import logger as log
+
+from ..internal.DeviceRegistry import DeviceRegistry
+
+
+class PageWarmup:
+    """
+    Collects actions that become ready at about the same time, like all keys of a page after a page switch,
+    and warms them up together.
+
+    Before a batch runs, the registry is made to hold a snapshot. If it is populated already, every action resolves
+    its device from memory. Otherwise one server_info + sink_list + source_list round trip fills it for the whole
+    batch, instead of a few queries per action.
+    """
+
+    def __init__(self, registry: DeviceRegistry, window: float = 0.01):
+        """
+        :param window: Seconds to wait for more actions after the first one got ready
+        """
+        self.registry = registry
+        self.window = window
+
+        self._condition = threading.Condition()
+        self._pending: dict[int, object] = {}  # id -> action, keeps the order actions got ready in
+        self._window_end: float = 0
+
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def add(self, action):
+        """
+        Queues action.warm_up(), an action queued twice in one batch is only warmed up once.
+        """
+        with self._condition:
+            if not self._pending:
+                self._window_end = time.monotonic() + self.window
+                self._condition.notify()
+
+            self._pending[id(action)] = action
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+
+                delay = self._window_end - time.monotonic()
+
+            # Actions getting ready until the window ends join the batch
+            if delay > 0:
+                time.sleep(delay)
+
+            self._flush()
+
+    def _flush(self):
+        with self._condition:
+            actions = list(self._pending.values())
+            self._pending.clear()
+
+        if not self.registry.populated:
+            # Falls back to the per action queries if the server can't be reached
+            self.registry.populate()
+
+        for action in actions:
+            try:
+                action.warm_up()
+            except Exception as e:
+                log.error(f"Error while warming up {action}. Error: {e}")
+                action.show_error(1)
@@ -0,0 +1,96 @@
+import gi
+
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from gi.repository import Adw
+
+from ..internal.SettingsWriteBehind import SettingsWriteBehind
+from ..internal.VolumeBackend import VolumeBackendType
+
+
+class PluginSettings:
+    def __init__(self, plugin_base: "AudioControl"):
+        self.plugin_base = plugin_base
+        # The fps slider is written and applied once the user stops dragging
+        self.settings_write_behind = SettingsWriteBehind(plugin_base.get_settings, plugin_base.set_settings,
+                                                         on_flush=self.on_settings_flushed)
+
+    def get_settings_area(self) -> Adw.PreferencesGroup:
+        self.build_ui()
+        self.load_ui_settings()
+        self.connect_events()
+
+        self.ui.connect("unrealize", self.on_settings_closed)
+
+        return self.ui
+
+    def build_ui(self) -> Adw.PreferencesGroup:
+        from ..internal.ConfigWidgets import SearchComboRow, ScaleRow
+
+        self.ui = Adw.PreferencesGroup()
+
+        self.volume_backend_dropdown = SearchComboRow(self.translate("settings-volume-backend"), use_single_line=True, hexpand=True)
+        self.ui.add(self.volume_backend_dropdown)
+
+        self.redraw_fps_scale = ScaleRow(title=self.translate("settings-redraw-fps"), value=30, min=1, max=60, step=1, text_left="1", text_right="60")
+        self.redraw_fps_scale.scale.set_draw_value(True)
+        self.redraw_fps_scale.scale.set_size_request(100, 30)
+        self.ui.add(self.redraw_fps_scale)
+
+        return self.ui
+
+    #
+    # SETTINGS
+    #
+
+    def load_ui_settings(self):
+        from ..internal.ConfigWidgets import VolumeBackendItem
+
+        items = [
+            VolumeBackendItem(self.translate("settings-backend-native"), VolumeBackendType.NATIVE),
+            VolumeBackendItem(self.translate("settings-backend-host-helper"), VolumeBackendType.HOST_HELPER),
+            VolumeBackendItem(self.translate("settings-backend-script"), VolumeBackendType.SCRIPT)
+        ]
+
+        self.volume_backend_dropdown.populate(items)
+
+        backend_type = self.plugin_base.get_volume_backend_type()
+
+        for i in range(len(items)):
+            if items[i].backend_type == backend_type:
+                self.volume_backend_dropdown.set_selected_item(i)
+                break
+
+        self.redraw_fps_scale.scale.set_value(self.plugin_base.get_redraw_fps())
+
+    #
+    # EVENTS
+    #
+
+    def connect_events(self):
+        self.volume_backend_dropdown.connect("item-changed", self.on_volume_backend_changed)
+        self.redraw_fps_scale.scale.connect("value-changed", self.on_redraw_fps_changed)
+
+    def on_volume_backend_changed(self, _, item: "VolumeBackendItem", index):
+        settings = self.plugin_base.get_settings()
+        settings["volume-backend"] = item.backend_type
+        self.plugin_base.set_settings(settings)
+
+        self.plugin_base.load_volume_backend()
+
+    def on_redraw_fps_changed(self, *args):
+        self.settings_write_behind.set("redraw-fps", int(self.redraw_fps_scale.scale.get_value()))
+
+    def on_settings_flushed(self, values: dict):
+        if "redraw-fps" in values:
+            self.plugin_base.redraw_scheduler.set_fps(values["redraw-fps"])
+
+    def on_settings_closed(self, *args):
+        self.settings_write_behind.flush()
+
+    #
+    # MISC
+    #
+
+    def translate(self, key):
+        return self.plugin_base.locale_manager.get(key)
@@ -0,0 +1,150 @@
+import threading
+from contextlib import contextmanager
+
+import pulsectl
+from loguru import logger as log
+
+
+class PulseConnectionPool:
+    """
+    Small pool of long-lived pulsectl clients shared by every helper in the plugin.
+
+    A pulsectl client must never be used by two threads at once, so clients are checked out
+    exclusively and handed back when the caller is done. Broken clients (e.g. after the
+    PipeWire-Pulse server restarted) are transparently reconnected.
+    """
+
+    def __init__(self, client_name: str, size: int = 3, primary: pulsectl.Pulse = None):
+        self.client_name = client_name
+        self.size = max(1, size)
+
+        self._condition = threading.Condition()
+        self._idle: list[pulsectl.Pulse] = []
+        self._created: int = 0
+
+        self._stats: dict[str, int] = {
+            "hits": 0,  # Checkout served by an idle client
+            "misses": 0,  # Checkout that had to open a new client
+            "waits": 0,  # Checkout that had to wait for a client to be returned
+            "reconnects": 0,  # Clients that had to be reconnected
+        }
+
+        if primary is not None:
+            self._idle.append(primary)
+            self._created += 1
+
+    #
+    # CHECKOUT
+    #
+
+    @contextmanager
+    def connection(self):
+        """
+        Checks out a connected client for the duration of the with block.
+        When the server drops the connection inside the block the client gets reconnected before it is returned.
+        """
+        pulse = self._checkout()
+        try:
+            yield pulse
+        except pulsectl.PulseDisconnected:
+            pulse = self._reconnect(pulse)
+            raise
+        finally:
+            self._checkin(pulse)
+
+    def run(self, func: callable, *args, **kwargs):
+        """
+        Calls func(pulse, *args, **kwargs) with a pooled client.
+        The call is retried once on a fresh connection if the server went away in the meantime.
+        """
+        try:
+            with self.connection() as pulse:
+                return func(pulse, *args, **kwargs)
+        except pulsectl.PulseDisconnected:
+            log.warning(f"Pulse connection lost while calling {getattr(func, '__name__', func)}, retrying")
+
+        with self.connection() as pulse:
+            return func(pulse, *args, **kwargs)
+
+    def _checkout(self) -> pulsectl.Pulse:
+        with self._condition:
+            if self._idle:
+                self._stats["hits"] += 1
+                pulse = self._idle.pop()
+            elif self._created < self.size:
+                self._stats["misses"] += 1
+                self._created += 1
+                pulse = None
+            else:
+                self._stats["waits"] += 1
+                while not self._idle:
+                    self._condition.wait()
+                pulse = self._idle.pop()
+
+        if pulse is None:
+            try:
+                return self._open()
+            except Exception:
+                with self._condition:
+                    self._created -= 1
+                    self._condition.notify()
+                raise
+
+        if not pulse.connected:
+            pulse = self._reconnect(pulse)
+            if pulse is None:
+                self._checkin(None)
+                raise pulsectl.PulseError("Could not connect to the Pulse server")
+        return pulse
+
+    def _checkin(self, pulse: pulsectl.Pulse):
+        with self._condition:
+            if pulse is None:
+                self._created -= 1
+            else:
+                self._idle.append(pulse)
+            self._condition.notify()
+
+    #
+    # CONNECTION HANDLING
+    #
+
+    def _open(self) -> pulsectl.Pulse:
+        return pulsectl.Pulse(f"{self.client_name}-{self._created}")
+
+    def _reconnect(self, pulse: pulsectl.Pulse) -> pulsectl.Pulse | None:
+        with self._condition:
+            self._stats["reconnects"] += 1
+
+        try:
+            pulse.close()
+        except Exception:
+            pass
+
+        try:
+            return self._open()
+        except Exception as e:
+            log.error(f"Could not reconnect to the Pulse server. Error: {e}")
+        return None
+
+    def close(self):
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+
+        for pulse in idle:
+            try:
+                pulse.close()
+            except Exception:
+                pass
+
+    #
+    # STATS
+    #
+
+    def get_stats(self) -> dict[str, int]:
+        with self._condition:
+            stats = dict(self._stats)
+            stats["open"] = self._created
+            stats["idle"] = len(self._idle)
+        return stats
@@ -1,24 +1,102 @@
 import threading
+import time
 
 import pulsectl
+from loguru import logger as log
 from src.backend.PluginManager.EventHolder import EventHolder
 
+from ..internal.PulseEventQueue import PulseEventQueue
+
 
 class PulseEvent(EventHolder):
-    def __init__(self, plugin_base: "PluginBase", event_id: str, *masks):
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, plugin_base: "PluginBase", event_id: str, *masks, listen: bool = True):
+        """
+        :param listen: Runs the blocking listener thread, turned off when the AsyncPulseEngine delivers the events
+        """
         super().__init__(plugin_base=plugin_base, event_id=event_id)
+        self.masks = masks
+        self.pulse_sink_thread = None
+        self.event_queue: PulseEventQueue = None
+
+        if not listen:
+            return
+
+        self.event_queue = PulseEventQueue(self._on_batch)
+
         self.pulse_sink_thread = threading.Thread(target=self._start_loop)
         self.pulse_sink_thread.daemon = True
         self.pulse_sink_thread.start()
 
-        self.masks = masks
-
     def _start_loop(self):
         self._loop()
 
     def _loop(self):
-        with pulsectl.Pulse("pulse-sink-event-loop") as pulse:
-            pulse.event_mask_set(*self.masks)
-            pulse.event_callback_set(lambda event: self.trigger_event(event))
-            while True:
-                pulse.event_listen()
\ No newline at end of file
+        connected_before = False
+
+        while True:
+            try:
+                with pulsectl.Pulse("pulse-sink-event-loop") as pulse:
+                    pulse.event_mask_set(*self.masks)
+                    pulse.event_callback_set(self.event_queue.put)
+
+                    # Events might have been missed while disconnected
+                    if connected_before:
+                        self._resync()
+                    connected_before = True
+
+                    while True:
+                        pulse.event_listen()
+            except Exception as e:
+                log.error(f"Pulse event listener lost its connection, reconnecting. Error: {e}")
+
+            # Nothing keeps the registry up to date anymore, the helpers have to ask the server until the resync
+            registry = getattr(self.plugin_base, "device_registry", None)
+            if registry is not None:
+                registry.invalidate()
+
+            time.sleep(self.RECONNECT_DELAY)
+
+    def get_stats(self) -> dict[str, int]:
+        return self.event_queue.get_stats() if self.event_queue is not None else {}
+
+    def _on_batch(self, events: list, overflowed: bool):
+        if overflowed:
+            self._resync()
+
+        for event in events:
+            self._on_event(event)
+
+    def _resync(self):
+        """
+        Events got dropped, so the registry can't be trusted anymore and every action has to re-read its device.
+        """
+        registry = getattr(self.plugin_base, "device_registry", None)
+        router = getattr(self.plugin_base, "device_event_router", None)
+
+        if registry is not None:
+            registry.populate()
+        if router is not None:
+            router.post_resync()
+
+    def _on_event(self, event):
+        # The registry has to be up to date before any action reads from it
+        registry = getattr(self.plugin_base, "device_registry", None)
+        router = getattr(self.plugin_base, "device_event_router", None)
+
+        if registry is not None:
+            device_filter = registry.get_event_filter(event)
+
+            if device_filter is not None:
+                pulse_device_name = registry.handle_event(event)
+
+                if router is not None:
+                    router.post(event, device_filter, pulse_device_name)
+            else:
+                for changed_filter in registry.handle_server_event(event):
+                    if router is not None:
+                        router.post_standard_change(event, changed_filter)
+
+        # Actions of this plugin are served by the router, this only reaches external listeners
+        self.trigger_event(event)
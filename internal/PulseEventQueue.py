@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+
+from loguru import logger as log
+
+
+class PulseEventQueue:
+    """
+    Bounded buffer between the pulse listener thread and the event handling.
+
+    Events are keyed by (facility, index), a newer event for the same device replaces the queued one, so a burst
+    costs one handler call per changed device instead of one per event. A worker thread drains everything queued
+    as one batch. If more than max_size distinct devices are waiting, new events are dropped and the next batch is
+    flagged as overflowed, the handler has to resync everything in that case.
+    """
+
+    def __init__(self, handle_batch: callable, max_size: int = 256):
+        """
+        :param handle_batch: Called as handle_batch(events, overflowed) on the worker thread
+        """
+        self.handle_batch = handle_batch
+        self.max_size = max_size
+
+        self._condition = threading.Condition()
+        self._pending: OrderedDict[tuple[str, int], object] = OrderedDict()
+        self._overflowed: bool = False
+        self._running: bool = True
+
+        self._stats: dict[str, int] = {
+            "received": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "overflows": 0,
+            "batches": 0,
+            "handled": 0,
+        }
+
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def put(self, event):
+        """
+        Never blocks, safe to call from the pulsectl event callback.
+        """
+        key = (str(event.facility), event.index)
+
+        with self._condition:
+            self._stats["received"] += 1
+
+            if key in self._pending:
+                self._stats["coalesced"] += 1
+                self._pending[key] = event
+                return
+
+            if len(self._pending) >= self.max_size:
+                self._stats["dropped"] += 1
+                if not self._overflowed:
+                    self._overflowed = True
+                    self._stats["overflows"] += 1
+                self._condition.notify()
+                return
+
+            self._pending[key] = event
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+    def get_stats(self) -> dict[str, int]:
+        with self._condition:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+        return stats
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while self._running and not self._pending and not self._overflowed:
+                    self._condition.wait()
+
+                if not self._running:
+                    return
+
+                events = list(self._pending.values())
+                overflowed = self._overflowed
+                self._pending.clear()
+                self._overflowed = False
+
+                self._stats["batches"] += 1
+                self._stats["handled"] += len(events)
+
+            try:
+                self.handle_batch(events, overflowed)
+            except Exception as e:
+                log.error(f"Error while handling a batch of {len(events)} pulse events. Error: {e}")
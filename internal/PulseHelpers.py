@@ -1,31 +1,47 @@
 import enum
+import functools
 
-from ..internal import GlobalHelpers
-import subprocess
+from ..internal.PulseConnectionPool import PulseConnectionPool
+from ..internal.VolumeBackend import VolumeBackend, NativeVolumeBackend
+from ..internal.HostHelper import HostHelperClient
 import pulsectl
 from loguru import logger as log
-import os
 
 class DeviceFilter(enum.StrEnum):
     SINK = "sink",
     SOURCE = "source",
 
 
-# always ensure the script is an executable
-subprocess.run([f"chmod", "+x", os.path.join(f"{GlobalHelpers.get_app_component_path("pulseaudio-ctl.sh", top_plugin_sub_folder="internal")}")])
+_connection_pool: PulseConnectionPool = None
+_volume_backend: VolumeBackend = None
+_host_helper: HostHelperClient = None
+_device_registry: "DeviceRegistry" = None
+
+PROPLIST_FILTERS: tuple[str, ...] = (
+    "alsa.card_name",
+    "alsa.long_card_name",
+    "node.name",
+    "node.nick",
+    "device.name",
+    "device.nick",
+    "device.description",
+    "device.serial"
+)
+
+
+def get_proplist_fingerprint(proplist) -> tuple[str | None, ...]:
+    """
+    The proplist values filter_proplist looks at. Devices with the same fingerprint get the same display name.
+    """
+    return tuple(proplist.get(filter) for filter in PROPLIST_FILTERS)
+
 
 def filter_proplist(proplist) -> str | None:
-    filters: list[str] = [
-        "alsa.card_name",
-        "alsa.long_card_name",
-        "node.name",
-        "node.nick",
-        "device.name",
-        "device.nick",
-        "device.description",
-        "device.serial"
-    ]
+    return _filter_proplist_values(get_proplist_fingerprint(proplist))
+
 
+@functools.lru_cache(maxsize=512)
+def _filter_proplist_values(values: tuple[str | None, ...]) -> str | None:
     weights: list[(str, int)] = [
         ('.', -50),
         ('_', -10),
@@ -38,9 +54,7 @@ def filter_proplist(proplist) -> str | None:
 
     minimal_weights: list[(int, str)] = []
 
-    for filter in filters:
-        out: str = proplist.get(filter)
-
+    for out in values:
         if out is None or len(out) < 3:
             continue
         current_weight: int = 0
@@ -57,15 +71,50 @@ def filter_proplist(proplist) -> str | None:
     return None
 
 
+def set_connection_pool(pool: PulseConnectionPool):
+    global _connection_pool
+    _connection_pool = pool
+
+
+def get_connection_pool() -> PulseConnectionPool:
+    global _connection_pool
+    if _connection_pool is None:
+        _connection_pool = PulseConnectionPool("audio-control")
+    return _connection_pool
+
+
+def set_device_registry(registry: "DeviceRegistry"):
+    global _device_registry
+    _device_registry = registry
+
+
+def get_device_registry() -> "DeviceRegistry | None":
+    """
+    Returns the registry only once it holds a full snapshot, callers fall back to querying the server otherwise.
+    """
+    if _device_registry is not None and _device_registry.populated:
+        return _device_registry
+    return None
+
+
+def _get_device(pulse: pulsectl.Pulse, filter: DeviceFilter, pulse_device_name):
+    if filter == DeviceFilter.SINK:
+        return pulse.get_sink_by_name(pulse_device_name)
+    elif filter == DeviceFilter.SOURCE:
+        return pulse.get_source_by_name(pulse_device_name)
+    return None
+
+
 def get_device(filter: DeviceFilter, pulse_device_name):
-    with pulsectl.Pulse("device-getter") as pulse:
+    registry = get_device_registry()
+    if registry is not None:
+        return registry.get_device(filter, pulse_device_name)
+
+    with get_connection_pool().connection() as pulse:
         try:
-            device = None
-            if filter == DeviceFilter.SINK:
-                device = pulse.get_sink_by_name(pulse_device_name)
-            elif filter == DeviceFilter.SOURCE:
-                device = pulse.get_source_by_name(pulse_device_name)
-            return device
+            return _get_device(pulse, filter, pulse_device_name)
+        except pulsectl.PulseDisconnected:
+            raise
         except Exception as e:
             if filter == DeviceFilter.SINK:
                 log.error(f"Error while getting device: {pulse_device_name} with filter: {filter}. Error: {e}.\nSinks:\n\t{pulse.sink_list()}")
@@ -75,15 +124,87 @@ def get_device(filter: DeviceFilter, pulse_device_name):
 
 
 def get_device_list(filter: DeviceFilter):
-    with pulsectl.Pulse("device-list-getter") as pulse:
-        switch = {
-            DeviceFilter.SINK: pulse.sink_list(),
-            DeviceFilter.SOURCE: pulse.source_list(),
-        }
-        return switch.get(filter, {})
+    registry = get_device_registry()
+    if registry is not None:
+        return registry.get_devices(filter)
+
+    def _list(pulse: pulsectl.Pulse):
+        if filter == DeviceFilter.SINK:
+            return pulse.sink_list()
+        elif filter == DeviceFilter.SOURCE:
+            return pulse.source_list()
+        return {}
+
+    return get_connection_pool().run(_list)
+
+
+def get_device_by_display_name(filter: DeviceFilter, display_name: str):
+    """
+    Maps a name shown in the device dropdown back to the device. Monitor devices are never returned.
+    """
+    registry = get_device_registry()
+    if registry is not None:
+        return registry.get_device_by_display_name(filter, display_name)
+
+    for device in get_device_list(filter):
+        if device.description.__contains__("Monitor"):
+            continue
+
+        if filter_proplist(device.proplist) == display_name:
+            return device
+    return None
+
+
+def get_device_display_names(filter: DeviceFilter) -> list[str]:
+    """
+    Display names for the device dropdown, monitor devices are left out.
+    """
+    registry = get_device_registry()
+    if registry is not None:
+        return registry.get_display_names(filter)
+
+    display_names = []
+    for device in get_device_list(filter):
+        if device.description.__contains__("Monitor"):
+            continue
+
+        display_name = filter_proplist(device.proplist)
+        if display_name is not None:
+            display_names.append(display_name)
+    return display_names
+
+
+def get_first_device(filter: DeviceFilter):
+    """
+    The first non monitor device, used when an action has no device selected yet.
+    """
+    registry = get_device_registry()
+    if registry is not None:
+        devices = registry.get_devices(filter, include_monitors=False)
+        return devices[0] if devices else None
+
+    for device in get_device_list(filter):
+        if not device.description.__contains__("Monitor"):
+            return device
+    return None
+
+
+def get_pulse_name(filter: DeviceFilter, display_name: str) -> str | None:
+    device = get_device_by_display_name(filter, display_name)
+    return device.name if device is not None else None
+
+
+def get_display_name(filter: DeviceFilter, pulse_device_name: str) -> str | None:
+    registry = get_device_registry()
+    if registry is not None:
+        return registry.get_display_name(filter, pulse_device_name)
+
+    device = get_device(filter, pulse_device_name)
+    return filter_proplist(device.proplist) if device is not None else None
 
 
 def get_volumes_from_device(device_filter: DeviceFilter, pulse_device_name: str):
+    device = None
     try:
         device = get_device(device_filter, pulse_device_name)
         device_volumes = device.volume.values
@@ -93,43 +214,112 @@ def get_volumes_from_device(device_filter: DeviceFilter, pulse_device_name: str)
         return []
 
 
-def change_volume(device, adjust: int):
-    with pulsectl.Pulse("change-volume") as pulse:
-        try:
-            adjust = int(adjust)
-            if adjust < 0:
-                adjust = -1*adjust
-                subprocess.run([f"flatpak-spawn", "--host", f"--directory={GlobalHelpers.plugin_base_dir()}", "internal/pulseaudio-ctl.sh", "down", f"{adjust}"])
+def get_volumes_for_devices(device_filter: DeviceFilter, pulse_device_names) -> dict[str, tuple[list[int], bool]]:
+    """
+    Volumes and mute state of several devices from a single device list, devices that don't exist are left out.
+    :return: Pulse name -> (volumes, muted)
+    """
+    names = set(pulse_device_names)
 
-            else:
-                subprocess.run([f"flatpak-spawn", "--host", f"--directory={GlobalHelpers.plugin_base_dir()}", "internal/pulseaudio-ctl.sh", "up", f"{adjust}"])
-            # pulse.volume_change_all_chans(device, adjust * 0.01)
-        except Exception as e:
-            log.error(f"Error while changing volume on device: {device.name}, adjustment is {adjust}. Error: {e}")
+    registry = get_device_registry()
+    try:
+        if registry is not None:
+            devices = [registry.get_device(device_filter, name) for name in names]
+        else:
+            devices = get_device_list(device_filter)
+    except Exception as e:
+        log.error(f"Error while getting volumes for {len(names)} devices with filter: {device_filter}. Error: {e}")
+        return {}
+
+    return {device.name: ([round(vol * 100) for vol in device.volume.values], bool(device.mute))
+            for device in devices if device is not None and device.name in names}
+
+
+def set_volume_backend(backend: VolumeBackend):
+    global _volume_backend
+    _volume_backend = backend
+
+
+def get_volume_backend() -> VolumeBackend:
+    global _volume_backend
+    if _volume_backend is None:
+        _volume_backend = NativeVolumeBackend(get_connection_pool())
+    return _volume_backend
+
+
+def get_host_helper() -> HostHelperClient:
+    """
+    The one host helper process all requests are multiplexed over. It is only spawned on the first request.
+    """
+    global _host_helper
+    if _host_helper is None:
+        _host_helper = HostHelperClient()
+    return _host_helper
+
+
+def stop_host_helper():
+    if _host_helper is not None:
+        _host_helper.stop()
+
+
+def change_volume(device, adjust: int, upper_bound: int = 100):
+    try:
+        get_volume_backend().change_volume(device, int(adjust), upper_bound)
+        return True
+    except Exception as e:
+        log.error(f"Error while changing volume on device: {device.name}, adjustment is {adjust}. Error: {e}")
+    return False
 
 def set_volume(device, volume: int):
-    with pulsectl.Pulse("change-volume") as pulse:
-        try:
-            subprocess.run([f"flatpak-spawn", "--host", f"--directory={GlobalHelpers.plugin_base_dir()}", "internal/pulseaudio-ctl.sh", "set", f"{volume}"])
-            # pulse.volume_set_all_chans(device, volume * 0.01)
-        except Exception as e:
-            log.error(f"Error while setting volume on device: {device.name}, volume is {volume}. Error: {e}")
+    try:
+        get_volume_backend().set_volume(device, int(volume))
+        return True
+    except Exception as e:
+        log.error(f"Error while setting volume on device: {device.name}, volume is {volume}. Error: {e}")
+    return False
 
 def mute(device, state):
-    with pulsectl.Pulse("change-volume") as pulse:
-        try:
-            subprocess.run([f"flatpak-spawn", "--host", f"--directory={GlobalHelpers.plugin_base_dir()}", "internal/pulseaudio-ctl.sh", "mute"])
-            # pulse.mute(device, state)
-        except Exception as e:
-            log.error(f"Error while muting device: {device.name}, state is {state}. Error: {e}")
+    try:
+        get_volume_backend().mute(device, bool(state))
+        return True
+    except Exception as e:
+        log.error(f"Error while muting device: {device.name}, state is {state}. Error: {e}")
+    return False
+
+def get_standard_device_name(device_filter: DeviceFilter) -> str | None:
+    registry = get_device_registry()
+    if registry is not None:
+        return registry.get_default_name(device_filter)
+
+    def _standard_name(pulse: pulsectl.Pulse):
+        if device_filter == DeviceFilter.SINK:
+            return pulse.server_info().default_sink_name
+        elif device_filter == DeviceFilter.SOURCE:
+            return pulse.server_info().default_source_name
+        return None
+
+    try:
+        return get_connection_pool().run(_standard_name)
+    except Exception as e:
+        log.error(f"Error while getting standard device name. Error: {e}")
+    return None
 
 def get_standard_device(device_filter: DeviceFilter):
-    with pulsectl.Pulse("change-volume") as pulse:
-        try:
-            if device_filter == DeviceFilter.SINK:
-                return get_device(device_filter, pulse.server_info().default_sink_name)
-            elif device_filter == DeviceFilter.SOURCE:
-                return get_device(device_filter, pulse.server_info().default_source_name)
+    registry = get_device_registry()
+    if registry is not None:
+        return registry.get_standard_device(device_filter)
+
+    def _standard(pulse: pulsectl.Pulse):
+        if device_filter == DeviceFilter.SINK:
+            name = pulse.server_info().default_sink_name
+        elif device_filter == DeviceFilter.SOURCE:
+            name = pulse.server_info().default_source_name
+        else:
             return None
-        except Exception as e:
-            log.error(f"Error while getting standard device for filter: {str(device_filter)}. Error: {e}")
\ No newline at end of file
+
+        return _get_device(pulse, device_filter, name)
+
+    try:
+        return get_connection_pool().run(_standard)
+    except Exception as e:
+        log.error(f"Error while getting standard device for filter: {str(device_filter)}. Error: {e}")
@@ -0,0 +1,98 @@
+import threading
+import time
+import weakref
+
+from loguru import logger as log
+
+
+class RedrawScheduler:
+    """
+    Collects label and media updates of all actions and pushes them at most fps times per second.
+
+    Every action has slots (e.g. "top", "bottom", "media"). Only the latest value of a slot survives until the next
+    frame and values equal to what the key already shows are dropped, so a volume ramp results in one redraw per
+    frame per key instead of one per pulse event.
+    """
+
+    def __init__(self, fps: int = 30):
+        self.fps = fps
+
+        self._condition = threading.Condition()
+        self._pending: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # action -> {slot: (value_key, apply)}
+        self._shown: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # action -> {slot: value_key}
+        self._last_flush: float = 0
+
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def queue(self, action, slot: str, value_key, apply: callable):
+        """
+        :param value_key: Compared against what the slot shows, equal values are skipped
+        :param apply: Called as apply(update: bool) to push the value, update=False if more values follow in the batch
+        """
+        with self._condition:
+            pending = self._pending.get(action)
+
+            if self._shown.get(action, {}).get(slot, self) == value_key:
+                if pending is not None:
+                    pending.pop(slot, None)
+                return
+
+            self._pending.setdefault(action, {})[slot] = (value_key, apply)
+            self._condition.notify()
+
+    def set_fps(self, fps: int):
+        with self._condition:
+            self.fps = fps
+
+    def reset(self, action):
+        """
+        Forgets what the action shows, everything queued afterwards is pushed again.
+        """
+        with self._condition:
+            self._shown.pop(action, None)
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+
+                delay = self._last_flush + 1 / max(1, self.fps) - time.monotonic()
+
+            # Values queued while waiting for the next frame are coalesced into it
+            if delay > 0:
+                time.sleep(delay)
+
+            self._flush()
+
+    def _flush(self):
+        with self._condition:
+            self._last_flush = time.monotonic()
+
+            pending = [(action, slots, self._shown.setdefault(action, {})) for action, slots in self._pending.items() if slots]
+            self._pending.clear()
+
+        for action, slots, shown in pending:
+            items = list(slots.items())
+
+            # Only the last change of a batch makes the key render
+            for i, (slot, (value_key, apply)) in enumerate(items):
+                try:
+                    apply(i == len(items) - 1)
+                except Exception as e:
+                    log.error(f"Error while redrawing {action}. Error: {e}")
+                    # What the key shows is unknown now, the next value for this slot has to be pushed
+                    applied = False
+                else:
+                    applied = True
+
+                with self._condition:
+                    # A reset while applying replaced the dict, the key got recreated and shows none of this
+                    if self._shown.get(action) is not shown:
+                        continue
+
+                    if applied:
+                        shown[slot] = value_key
+                    else:
+                        shown.pop(slot, None)
@@ -0,0 +1,84 @@
+from gi.repository import GLib
+
+SettingValue = int | float | bool | str | None
+
+
+class SettingsWriteBehind:
+    """
+    Keeps settings changed by sliders in memory and writes them in one go once the user stopped for idle_ms,
+    or when flush() is called (e.g. when the configuration area closes).
+
+    Runs on the GTK main loop, like the signal handlers feeding it.
+    """
+
+    def __init__(self, read: callable, write: callable, idle_ms: int = 500, on_flush: callable = None):
+        """
+        :param read: Returns the stored settings dict
+        :param write: Stores a settings dict
+        :param on_flush: Called with the values that just got written, for changes that should only apply once settled
+        """
+        self.read = read
+        self.write = write
+        self.idle_ms = idle_ms
+        self.on_flush = on_flush
+
+        self._pending: dict[str, SettingValue] = {}
+        self._source_id: int = None
+
+        self._stats: dict[str, int] = {
+            "changes": 0,
+            "writes": 0,
+        }
+
+    def set(self, key: str, value: SettingValue):
+        self._pending[key] = value
+        self._stats["changes"] += 1
+
+        # Every change restarts the idle period
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+        self._source_id = GLib.timeout_add(self.idle_ms, self._on_idle)
+
+    def get_pending(self) -> dict[str, SettingValue]:
+        return dict(self._pending)
+
+    def mark_written(self, settings: dict):
+        """
+        Called when settings got written some other way, pending values they already contain don't need a write anymore.
+        """
+        for key in [key for key, value in self._pending.items() if key in settings and settings[key] == value]:
+            del self._pending[key]
+
+        if not self._pending and self._source_id is not None:
+            GLib.source_remove(self._source_id)
+            self._source_id = None
+
+    def flush(self):
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+            self._source_id = None
+
+        if not self._pending:
+            return
+
+        values = dict(self._pending)
+        self._pending.clear()
+
+        settings = self.read()
+        settings.update(values)
+
+        self.write(settings)
+        self._stats["writes"] += 1
+
+        if self.on_flush is not None:
+            self.on_flush(values)
+
+    def get_stats(self) -> dict[str, int]:
+        stats = dict(self._stats)
+        stats["saved"] = stats["changes"] - stats["writes"] - len(self._pending)
+        return stats
+
+    def _on_idle(self):
+        self._source_id = None
+        self.flush()
+        return False
@@ -0,0 +1,189 @@
+import concurrent.futures
+import enum
+import os
+import stat
+import subprocess
+
+import pulsectl
+from loguru import logger as log
+
+from ..internal.HostHelper import HostHelperClient
+from ..internal.PulseConnectionPool import PulseConnectionPool
+
+
+class VolumeBackendType(enum.StrEnum):
+    NATIVE = "native",
+    SCRIPT = "script",
+    HOST_HELPER = "host-helper",
+
+
+class VolumeBackend:
+    """
+    Executes volume and mute commands for a device. Every backend gets the pulsectl device info object of the target.
+    """
+
+    def change_volume(self, device, adjust: int, upper_bound: int = 100):
+        pass
+
+    def set_volume(self, device, volume: int):
+        pass
+
+    def mute(self, device, state: bool):
+        pass
+
+
+class NativeVolumeBackend(VolumeBackend):
+    """
+    Talks to the Pulse server in-process over a pooled connection, one IPC round trip per command.
+    """
+
+    def __init__(self, pool: PulseConnectionPool):
+        self.pool = pool
+
+    def change_volume(self, device, adjust: int, upper_bound: int = 100):
+        def _change(pulse: pulsectl.Pulse):
+            current = max(device.volume.values)
+            target = current + adjust * 0.01
+
+            # Same behaviour as the script: raising never goes past the upper bound
+            if adjust > 0:
+                target = min(target, upper_bound * 0.01)
+            target = max(target, 0)
+
+            pulse.volume_change_all_chans(device, target - current)
+
+        self.pool.run(_change)
+
+    def set_volume(self, device, volume: int):
+        self.pool.run(lambda pulse: pulse.volume_set_all_chans(device, volume * 0.01))
+
+    def mute(self, device, state: bool):
+        self.pool.run(lambda pulse: pulse.mute(device, state))
+
+
+class ScriptVolumeBackend(VolumeBackend):
+    """
+    Fallback that runs pulseaudio-ctl.sh on the host through flatpak-spawn. Only ever acts on the default sink.
+    """
+
+    SCRIPT_PATH = os.path.join("internal", "pulseaudio-ctl.sh")
+
+    def __init__(self):
+        self._checked_executable: bool = False
+
+    @staticmethod
+    def _base_dir() -> str:
+        # GlobalHelpers pulls in StreamController, so it is only imported once the script actually runs
+        from ..internal import GlobalHelpers
+        return GlobalHelpers.plugin_base_dir()
+
+    def _ensure_executable(self):
+        # Only done once the script is actually used, so plugin startup never touches it
+        path = os.path.join(self._base_dir(), self.SCRIPT_PATH)
+
+        try:
+            mode = os.stat(path).st_mode
+            if not mode & stat.S_IXUSR:
+                os.chmod(path, mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        except OSError as e:
+            log.error(f"Could not make {path} executable. Error: {e}")
+
+        self._checked_executable = True
+
+    def _run(self, *args):
+        if not self._checked_executable:
+            self._ensure_executable()
+
+        subprocess.run(["flatpak-spawn", "--host", f"--directory={self._base_dir()}", self.SCRIPT_PATH, *args])
+
+    def change_volume(self, device, adjust: int, upper_bound: int = 100):
+        if adjust < 0:
+            self._run("down", f"{-adjust}")
+        else:
+            self._run("up", f"{adjust}")
+
+    def set_volume(self, device, volume: int):
+        self._run("set", f"{volume}")
+
+    def mute(self, device, state: bool):
+        self._run("mute")
+
+
+class HostHelperVolumeBackend(VolumeBackend):
+    """
+    Sends commands to the persistent host helper, so sandboxed installs pay a pipe write instead of a process spawn.
+    Commands already run on the command executor, so waiting for the response only blocks that thread.
+    """
+
+    def __init__(self, client: HostHelperClient, timeout: float = 2.0):
+        self.client = client
+        self.timeout = timeout
+
+    def _send(self, cmd: str, device, **kwargs):
+        filter = "source" if isinstance(device, pulsectl.PulseSourceInfo) else "sink"
+        future = self.client.request(cmd, filter=filter, device=device.name, **kwargs)
+        future.add_done_callback(lambda f: self._on_done(cmd, device, f))
+
+        try:
+            # Raises the helper's error, so it reaches the command's on_done
+            future.result(self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def _on_done(self, cmd: str, device, future):
+        if future.cancelled():
+            log.error(f"Host helper did not answer {cmd} on device: {device.name} in time")
+        elif future.exception():
+            log.error(f"Host helper failed to run {cmd} on device: {device.name}. Error: {future.exception()}")
+
+    def change_volume(self, device, adjust: int, upper_bound: int = 100):
+        self._send("change", device, value=adjust, upper_bound=upper_bound)
+
+    def set_volume(self, device, volume: int):
+        self._send("set", device, value=volume)
+
+    def mute(self, device, state: bool):
+        self._send("mute", device, value=state)
+
+
+class EngineVolumeBackend(VolumeBackend):
+    """
+    Runs commands on the AsyncPulseEngine, sharing its connection and loop with the event stream.
+    """
+
+    def __init__(self, engine: "AsyncPulseEngine", timeout: float = 2.0):
+        self.engine = engine
+        self.timeout = timeout
+
+    def _run(self, coroutine):
+        future = self.engine.run(coroutine)
+
+        try:
+            future.result(self.timeout)
+        except concurrent.futures.TimeoutError:
+            # Already reported as failed, it must not be applied after newer commands
+            future.cancel()
+            raise
+
+    def change_volume(self, device, adjust: int, upper_bound: int = 100):
+        self._run(self.engine.change_volume(device, adjust, upper_bound))
+
+    def set_volume(self, device, volume: int):
+        self._run(self.engine.set_volume(device, volume))
+
+    def mute(self, device, state: bool):
+        self._run(self.engine.mute(device, state))
+
+
+def create_volume_backend(backend_type: VolumeBackendType, pool: PulseConnectionPool,
+                          host_helper: HostHelperClient = None, engine: "AsyncPulseEngine" = None) -> VolumeBackend:
+    if backend_type == VolumeBackendType.SCRIPT:
+        return ScriptVolumeBackend()
+    if backend_type == VolumeBackendType.HOST_HELPER and host_helper is not None:
+        return HostHelperVolumeBackend(host_helper)
+    if backend_type != VolumeBackendType.NATIVE:
+        log.warning(f"Unknown volume backend: {backend_type}, falling back to {VolumeBackendType.NATIVE}")
+    if engine is not None:
+        return EngineVolumeBackend(engine)
+    return NativeVolumeBackend(pool)
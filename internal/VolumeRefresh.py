@@ -0,0 +1,71 @@
+import threading
+import time
+
+from loguru import logger as log
+
+from ..internal.PulseHelpers import DeviceFilter, get_volumes_for_devices
+
+
+class VolumeRefresh:
+    """
+    Groups the volume lookups of all actions that want to show their volume within one tick.
+
+    Every tick does one get_volumes_for_devices call per filter, so a wall of volume keys refreshing together
+    costs one device list instead of one lookup per key.
+    """
+
+    def __init__(self, tick: float = 1 / 60):
+        self.tick = tick
+
+        self._condition = threading.Condition()
+        self._pending: dict[int, object] = {}  # id -> action
+        self._tick_end: float = 0
+
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def request(self, action):
+        """
+        action.on_volumes_refreshed(volumes) gets called on the next tick.
+        """
+        with self._condition:
+            if not self._pending:
+                self._tick_end = time.monotonic() + self.tick
+                self._condition.notify()
+
+            self._pending[id(action)] = action
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+
+                delay = self._tick_end - time.monotonic()
+
+            # Requests arriving until the tick ends join it
+            if delay > 0:
+                time.sleep(delay)
+
+            self._flush()
+
+    def _flush(self):
+        with self._condition:
+            actions = list(self._pending.values())
+            self._pending.clear()
+
+        groups: dict[DeviceFilter, list[tuple[object, str | None]]] = {}
+        for action in actions:
+            try:
+                groups.setdefault(action.device_filter, []).append((action, action.get_volume_device_name()))
+            except Exception as e:
+                log.error(f"Error while resolving the device of {action}. Error: {e}")
+
+        for device_filter, targets in groups.items():
+            volumes = get_volumes_for_devices(device_filter, [name for _, name in targets if name is not None])
+
+            for action, name in targets:
+                try:
+                    action.on_volumes_refreshed(volumes.get(name, ([], False))[0])
+                except Exception as e:
+                    log.error(f"Error while showing the volume of {action}. Error: {e}")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Long-running helper that executes volume commands on the host for sandboxed (flatpak) installs.
+
+It is started once through flatpak-spawn and then reads one JSON request per line from stdin and
+answers with one JSON response per line on stdout:
+
+    -> {"id": 1, "cmd": "change", "filter": "sink", "device": "alsa_output...", "value": -5, "upper_bound": 100}
+    <- {"id": 1, "ok": true}
+
+Commands: ping, change, set, mute, get
+Start with --stand-in to keep device state in memory instead of talking to a Pulse server.
+"""
+
+import json
+import re
+import subprocess
+import sys
+
+
+class PactlExecutor:
+    """Runs commands through pactl, used when pulsectl is not installed on the host."""
+
+    def _volume(self, filter: str, device: str) -> int:
+        out = subprocess.run(["pactl", f"get-{filter}-volume", device], capture_output=True, text=True, check=True).stdout
+        volumes = [int(v) for v in re.findall(r"(\d+)%", out)]
+        return max(volumes) if volumes else 0
+
+    def change(self, filter: str, device: str, value: int, upper_bound: int = 100):
+        current = self._volume(filter, device)
+        target = current + value
+
+        if value > 0:
+            target = min(target, upper_bound)
+        self.set(filter, device, max(target, 0))
+
+    def set(self, filter: str, device: str, value: int):
+        subprocess.run(["pactl", f"set-{filter}-volume", device, f"{int(value)}%"], check=True)
+
+    def mute(self, filter: str, device: str, value: bool):
+        subprocess.run(["pactl", f"set-{filter}-mute", device, "1" if value else "0"], check=True)
+
+    def get(self, filter: str, device: str):
+        out = subprocess.run(["pactl", f"get-{filter}-mute", device], capture_output=True, text=True, check=True).stdout
+        return {"volume": self._volume(filter, device), "mute": "yes" in out}
+
+
+class PulsectlExecutor:
+    """Runs commands over a single persistent pulsectl connection."""
+
+    def __init__(self, pulsectl):
+        self.pulse = pulsectl.Pulse("audio-control-host-helper")
+
+    def _device(self, filter: str, device: str):
+        if filter == "source":
+            return self.pulse.get_source_by_name(device)
+        return self.pulse.get_sink_by_name(device)
+
+    def change(self, filter: str, device: str, value: int, upper_bound: int = 100):
+        info = self._device(filter, device)
+        current = max(info.volume.values)
+        target = current + value * 0.01
+
+        if value > 0:
+            target = min(target, upper_bound * 0.01)
+        self.pulse.volume_change_all_chans(info, max(target, 0) - current)
+
+    def set(self, filter: str, device: str, value: int):
+        self.pulse.volume_set_all_chans(self._device(filter, device), value * 0.01)
+
+    def mute(self, filter: str, device: str, value: bool):
+        self.pulse.mute(self._device(filter, device), bool(value))
+
+    def get(self, filter: str, device: str):
+        info = self._device(filter, device)
+        return {"volume": round(max(info.volume.values) * 100), "mute": bool(info.mute)}
+
+
+class StandInExecutor:
+    """Keeps device state in memory. Lets the plugin side be exercised without a Pulse server."""
+
+    def __init__(self):
+        self.devices: dict[tuple[str, str], dict] = {}
+
+    def _device(self, filter: str, device: str) -> dict:
+        return self.devices.setdefault((filter, device), {"volume": 50, "mute": False})
+
+    def change(self, filter: str, device: str, value: int, upper_bound: int = 100):
+        state = self._device(filter, device)
+        target = state["volume"] + value
+
+        if value > 0:
+            target = min(target, upper_bound)
+        state["volume"] = max(target, 0)
+
+    def set(self, filter: str, device: str, value: int):
+        self._device(filter, device)["volume"] = int(value)
+
+    def mute(self, filter: str, device: str, value: bool):
+        self._device(filter, device)["mute"] = bool(value)
+
+    def get(self, filter: str, device: str):
+        return dict(self._device(filter, device))
+
+
+def create_executor(stand_in: bool):
+    if stand_in:
+        return StandInExecutor()
+
+    try:
+        import pulsectl
+        return PulsectlExecutor(pulsectl)
+    except Exception:
+        return PactlExecutor()
+
+
+def handle(executor, request: dict) -> dict:
+    cmd = request.get("cmd")
+    response = {"id": request.get("id"), "ok": True}
+
+    if cmd == "ping":
+        return response
+
+    handler = getattr(executor, cmd, None) if cmd in ("change", "set", "mute", "get") else None
+    if handler is None:
+        return {"id": request.get("id"), "ok": False, "error": f"Unknown command: {cmd}"}
+
+    kwargs = {"filter": request.get("filter", "sink"), "device": request["device"]}
+    if cmd != "get":
+        kwargs["value"] = request["value"]
+    if cmd == "change":
+        kwargs["upper_bound"] = request.get("upper_bound", 100)
+
+    result = handler(**kwargs)
+    if result is not None:
+        response["result"] = result
+    return response
+
+
+def main():
+    executor = create_executor("--stand-in" in sys.argv[1:])
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        request = {}
+        try:
+            request = json.loads(line)
+            response = handle(executor, request)
+        except Exception as e:
+            response = {"id": request.get("id"), "ok": False, "error": str(e)}
+
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
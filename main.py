@@ -1,7 +1,13 @@
+import atexit
+import time
+
+_import_started = time.perf_counter()
+
 # Import StreamController modules
 import os.path
 
 import pulsectl
+from loguru import logger as log
 
 from src.backend.PluginManager.ActionHolder import ActionHolder
 from src.backend.PluginManager.ActionInputSupport import ActionInputSupport
@@ -16,10 +22,32 @@ from .actions.SetVolume import SetVolume
 from .actions.VolumeDisplay import VolumeDisplay
 from .actions.DialController import DialController
 from .internal.PulseEventListener import PulseEvent
+from .internal.PulseConnectionPool import PulseConnectionPool
+from .internal.PulseHelpers import set_connection_pool, set_volume_backend, get_host_helper, stop_host_helper, \
+    set_device_registry
+from .internal.VolumeBackend import VolumeBackendType, create_volume_backend
+from .internal.PluginSettings import PluginSettings
+from .internal.DeviceRegistry import DeviceRegistry
+from .internal.DeviceListModel import DeviceListModel
+from .internal.DeviceEventRouter import DeviceEventRouter
+from .internal.AsyncPulseEngine import AsyncPulseEngine
+from .internal.CommandExecutor import CommandExecutor
+from .internal.RedrawScheduler import RedrawScheduler
+from .internal.PageWarmup import PageWarmup
+from .internal.VolumeRefresh import VolumeRefresh
+
+
+_import_time = time.perf_counter() - _import_started
 
 
 class AudioControl(PluginBase):
+    # Seconds importing and registering the plugin may take before it is reported as slow
+    STARTUP_BUDGET: float = 0.25
+    PULSE_EVENT_MASKS: tuple[str, ...] = ("sink", "source", "server")
+
     def __init__(self):
+        init_started = time.perf_counter()
+
         super().__init__(use_legacy_locale=False)
         self.init_vars()
 
@@ -72,17 +100,50 @@ class AudioControl(PluginBase):
 
         # Events
 
+        # With the async engine running the holder only forwards its events to other plugins
         self.pulse_sink_event_holder = PulseEvent(
             self,
             "com_kawaiishay_AudioControl::PulseEvent",
-            "sink", "source"
+            *self.PULSE_EVENT_MASKS,
+            listen=self.pulse_engine is None
         )
         self.add_event_holder(self.pulse_sink_event_holder)
 
+        if self.pulse_engine is not None:
+            self.pulse_engine.start(self.pulse_sink_event_holder)
+
         self.register()
 
+        self.log_startup_time(time.perf_counter() - init_started)
+
     def init_vars(self):
         self.pulse = pulsectl.Pulse("audio-control-main")
+        self.pulse_pool = PulseConnectionPool("audio-control", size=3, primary=self.pulse)
+        set_connection_pool(self.pulse_pool)
+
+        self.device_registry = DeviceRegistry(self.pulse_pool)
+        set_device_registry(self.device_registry)
+        self.device_list_model = DeviceListModel(self.device_registry)
+        self.device_event_router = DeviceEventRouter(self.device_registry, "com_kawaiishay_AudioControl::PulseEvent")
+
+        self.pulse_engine = None
+        if AsyncPulseEngine.is_available():
+            self.pulse_engine = AsyncPulseEngine(self.device_registry, self.device_event_router, self.PULSE_EVENT_MASKS)
+        else:
+            log.info("pulsectl_asyncio is not installed, using the threaded pulse event listener")
+
+        # The engine fills the registry with its first snapshot, the threaded listener relies on this one
+        if self.pulse_engine is None:
+            self.device_registry.populate()
+
+        self.load_volume_backend()
+        self.command_executor = CommandExecutor()
+        self.redraw_scheduler = RedrawScheduler(self.get_redraw_fps())
+        self.page_warmup = PageWarmup(self.device_registry)
+        self.volume_refresh = VolumeRefresh()
+
+        self.plugin_settings = PluginSettings(self)
+
         self.asset_manager = AssetManager(save_path=os.path.join(self.PATH, "asset_overrides.json"))
 
         self.asset_manager.icons.add_asset("mute", Icon(path=self.get_asset_path("mute.png")))
@@ -90,6 +151,50 @@ class AudioControl(PluginBase):
         self.asset_manager.icons.add_asset("vol-down", Icon(path=self.get_asset_path("vol_down.png")))
         self.asset_manager.icons.add_asset("vol-up", Icon(path=self.get_asset_path("vol_up.png")))
 
+        atexit.register(self.shutdown)
+
+    def shutdown(self):
+        """
+        Stops everything that keeps a connection or a thread of its own
+        """
+        if self.pulse_engine is not None:
+            self.pulse_engine.stop()
+        stop_host_helper()
+        self.asset_manager.flush()
+
+        log.debug(f"Pulse connection pool stats: {self.pulse_pool.get_stats()}")
+        if self.pulse_sink_event_holder.event_queue is not None:
+            log.debug(f"Pulse event queue stats: {self.pulse_sink_event_holder.get_stats()}")
+
+    def log_startup_time(self, init_time: float):
+        total = _import_time + init_time
+        message = f"Startup took {total * 1000:.1f}ms (imports {_import_time * 1000:.1f}ms, init {init_time * 1000:.1f}ms)"
+
+        if total > self.STARTUP_BUDGET:
+            log.warning(f"{message}, over the budget of {self.STARTUP_BUDGET * 1000:.0f}ms")
+        else:
+            log.info(message)
+
+    def get_settings_area(self):
+        return self.plugin_settings.get_settings_area()
+
+    def get_volume_backend_type(self) -> VolumeBackendType:
+        backend_type = self.get_settings().get("volume-backend", VolumeBackendType.NATIVE)
+
+        try:
+            return VolumeBackendType(backend_type)
+        except ValueError:
+            return VolumeBackendType.NATIVE
+
+    def get_redraw_fps(self) -> int:
+        return int(self.get_settings().get("redraw-fps", 30))
+
+    def load_volume_backend(self):
+        backend_type = self.get_volume_backend_type()
+
+        host_helper = get_host_helper() if backend_type == VolumeBackendType.HOST_HELPER else None
+        set_volume_backend(create_volume_backend(backend_type, self.pulse_pool, host_helper, self.pulse_engine))
+
     def get_asset_path(self, asset_name: str, subdirs: list[str] = None, asset_folder: str = "assets") -> str:
         if not subdirs:
             return os.path.join(self.PATH, asset_folder, asset_name)
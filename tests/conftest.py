@@ -0,0 +1,22 @@
+import os
+import sys
+import types
+
+import pytest
+
+# StreamController imports plugins as a package named after the plugin id, the relative imports depend on it
+PACKAGE_NAME = "com_kawaiishay_AudioControl"
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if PACKAGE_NAME not in sys.modules:
+    package = types.ModuleType(PACKAGE_NAME)
+    package.__path__ = [PLUGIN_ROOT]
+    sys.modules[PACKAGE_NAME] = package
+
+
+@pytest.fixture
+def stand_in_command() -> list[str]:
+    """
+    Runs the host helper against in-memory devices instead of a Pulse server.
+    """
+    return [sys.executable, os.path.join(PLUGIN_ROOT, "internal", "pulse-host-helper.py"), "--stand-in"]
@@ -0,0 +1,75 @@
+import threading
+
+from com_kawaiishay_AudioControl.internal.CommandExecutor import CommandExecutor
+
+
+def run_all(executor: CommandExecutor, key="device"):
+    done = threading.Event()
+    executor.submit(key, lambda: None, lambda result, error: done.set())
+    assert done.wait(2)
+
+
+def test_commands_of_a_key_run_in_order():
+    executor = CommandExecutor(max_pending=100)
+    ran: list[int] = []
+
+    for i in range(50):
+        executor.submit("device", lambda i=i: ran.append(i))
+    run_all(executor)
+
+    assert ran == list(range(50))
+    executor.stop()
+
+
+def test_keys_are_served_round_robin():
+    executor = CommandExecutor()
+    gate = threading.Event()
+    ran: list[str] = []
+
+    # Holds the worker until everything is queued
+    executor.submit("blocker", gate.wait)
+    for i in range(3):
+        executor.submit("a", lambda i=i: ran.append(f"a{i}"))
+        executor.submit("b", lambda i=i: ran.append(f"b{i}"))
+
+    gate.set()
+    run_all(executor, "a")
+    run_all(executor, "b")
+
+    assert ran == ["a0", "b0", "a1", "b1", "a2", "b2"]
+    executor.stop()
+
+
+def test_full_queue_rejects_commands():
+    executor = CommandExecutor(max_pending=2)
+    gate = threading.Event()
+    drained = threading.Event()
+
+    assert executor.submit("device", gate.wait)
+    assert executor.submit("device", lambda: None, lambda result, error: drained.set())
+    assert not executor.submit("device", lambda: None)
+
+    # Other devices have queues of their own
+    assert executor.submit("other", lambda: None)
+
+    gate.set()
+    assert drained.wait(2)
+    assert executor.submit("device", lambda: None)
+    executor.stop()
+
+
+def test_on_done_gets_result_and_error():
+    executor = CommandExecutor()
+    results = []
+    done = threading.Event()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    executor.submit("device", lambda: 42, lambda result, error: results.append((result, error)))
+    executor.submit("device", fail, lambda result, error: (results.append((result, error)), done.set()))
+    assert done.wait(2)
+
+    assert results[0] == (42, None)
+    assert results[1][0] is None and isinstance(results[1][1], RuntimeError)
+    executor.stop()
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+try:
+    from com_kawaiishay_AudioControl.internal.DeviceIndex import DeviceIndex
+except (ImportError, OSError):
+    # pulsectl needs libpulse at import time
+    pytest.skip("pulsectl is not available", allow_module_level=True)
+
+
+def device(index: int, name: str, description: str, volume: float = 0.5):
+    return SimpleNamespace(index=index, name=name, description=description,
+                           proplist={"device.description": description}, volume=volume)
+
+
+def test_adding_and_removing_devices_bumps_the_version():
+    index = DeviceIndex()
+    version = index.version
+
+    index.store(device(1, "alsa_output.speakers", "Speakers"))
+    assert index.version > version
+    version = index.version
+
+    index.remove(1)
+    assert index.version > version
+    assert index.get_display_names() == []
+
+
+def test_volume_changes_keep_the_version():
+    index = DeviceIndex()
+    index.store(device(1, "alsa_output.speakers", "Speakers"))
+    version = index.version
+
+    index.store(device(1, "alsa_output.speakers", "Speakers", volume=0.8))
+
+    assert index.version == version
+    assert index.get(1).volume == 0.8
+
+
+def test_renaming_a_device_bumps_the_version():
+    index = DeviceIndex()
+    index.store(device(1, "alsa_output.speakers", "Speakers"))
+    version = index.version
+
+    index.store(device(1, "alsa_output.speakers", "Desk Speakers"))
+
+    assert index.version > version
+    assert index.get_display_names() == ["Desk Speakers"]
+    assert index.get_by_display_name("Speakers") is None
+
+
+def test_removing_an_unknown_device_keeps_the_version():
+    index = DeviceIndex()
+    version = index.version
+
+    assert index.remove(42) is None
+    assert index.version == version
+
+
+def test_monitors_are_not_listed():
+    index = DeviceIndex()
+    index.store(device(1, "alsa_output.speakers", "Speakers"))
+    index.store(device(2, "alsa_output.speakers.monitor", "Monitor of Speakers"))
+
+    assert index.get_display_names() == ["Speakers"]
+    assert index.get_by_name("alsa_output.speakers.monitor").index == 2
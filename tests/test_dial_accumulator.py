@@ -0,0 +1,87 @@
+import time
+
+from com_kawaiishay_AudioControl.internal.DialAccumulator import DialAccumulator
+
+
+class FakeDevice:
+    def __init__(self, volume: int, latency: float = 0):
+        self.volume = volume
+        self.latency = latency
+        self.changes: list[int] = []
+        self.fail = False
+
+    def apply(self, adjust: int) -> bool:
+        time.sleep(self.latency)
+        self.changes.append(adjust)
+
+        if self.fail:
+            return False
+        self.volume += adjust
+        return True
+
+
+def wait_idle(accumulator: DialAccumulator, timeout: float = 2):
+    deadline = time.monotonic() + timeout
+    while accumulator.get_target() is not None and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_detents_within_a_window_are_summed():
+    device = FakeDevice(50)
+    accumulator = DialAccumulator(device.apply, window=0.05)
+
+    for _ in range(5):
+        accumulator.add(2, lambda: device.volume)
+
+    assert accumulator.get_target() == 60
+    wait_idle(accumulator)
+
+    assert device.changes == [10]
+    assert device.volume == 60
+    assert accumulator.get_target() is None
+
+
+def test_changes_are_relative_to_the_last_applied_target():
+    # The start volume is only read once per turn, a stale read afterwards must not skew the changes
+    device = FakeDevice(50, latency=0.01)
+    accumulator = DialAccumulator(device.apply, window=0.005)
+
+    for _ in range(10):
+        accumulator.add(1, lambda: 50)
+        time.sleep(0.008)
+    wait_idle(accumulator)
+
+    assert sum(device.changes) == 10
+    assert device.volume == 60
+
+
+def test_only_raising_is_capped():
+    device = FakeDevice(120)
+    accumulator = DialAccumulator(device.apply, window=0.01)
+
+    assert accumulator.add(-1, lambda: device.volume, upper_bound=100) == 119
+    wait_idle(accumulator)
+    assert device.volume == 119
+
+    assert accumulator.add(5, lambda: device.volume, upper_bound=100) == 100
+    wait_idle(accumulator)
+    assert device.volume == 100
+
+
+def test_failed_change_resyncs_the_next_turn():
+    device = FakeDevice(50)
+    accumulator = DialAccumulator(device.apply, window=0.01)
+
+    device.fail = True
+    accumulator.add(5, lambda: device.volume)
+    wait_idle(accumulator)
+
+    device.fail = False
+    assert accumulator.add(1, lambda: device.volume) == 51
+    wait_idle(accumulator)
+    assert device.volume == 51
+
+
+def test_unknown_volume_is_reported():
+    accumulator = DialAccumulator(lambda adjust: True, window=0.01)
+    assert accumulator.add(1, lambda: None) is None
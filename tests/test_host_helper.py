@@ -0,0 +1,58 @@
+import sys
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from com_kawaiishay_AudioControl.internal.HostHelper import HostHelperClient
+
+
+@pytest.fixture
+def client(stand_in_command):
+    client = HostHelperClient(stand_in_command)
+    yield client
+    client.stop()
+
+
+def test_round_trip(client):
+    assert client.request("ping").result(5) is None
+
+    client.request("set", filter="sink", device="speakers", value=40).result(5)
+    client.request("change", filter="sink", device="speakers", value=70, upper_bound=100).result(5)
+    client.request("mute", filter="sink", device="speakers", value=True).result(5)
+
+    assert client.request("get", filter="sink", device="speakers").result(5) == {"volume": 100, "mute": True}
+
+
+def test_requests_are_matched_by_id(client):
+    futures = [client.request("set", filter="source", device=f"mic-{i}", value=i) for i in range(20)]
+    for future in futures:
+        future.result(5)
+
+    results = [client.request("get", filter="source", device=f"mic-{i}") for i in range(20)]
+    assert [future.result(5)["volume"] for future in results] == list(range(20))
+
+
+def test_helper_errors_reach_the_future(client):
+    with pytest.raises(RuntimeError, match="Unknown command"):
+        client.request("reboot", device="speakers").result(5)
+
+
+def test_unanswered_request_times_out_and_stop_fails_it():
+    # Reads requests but never answers
+    client = HostHelperClient([sys.executable, "-c", "import sys\nfor _ in sys.stdin: pass"])
+    future = client.request("ping")
+
+    with pytest.raises(TimeoutError):
+        future.result(0.2)
+
+    client.stop()
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        future.result(1)
+
+
+def test_cancelled_request_ignores_late_answer(client):
+    client.request("ping").cancel()
+
+    # The answer arriving for the cancelled request must not break the reader
+    assert client.request("ping").result(5) is None
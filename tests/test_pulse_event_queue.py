@@ -0,0 +1,70 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from com_kawaiishay_AudioControl.internal.PulseEventQueue import PulseEventQueue
+
+
+def event(facility: str, index: int, t: str = "change"):
+    return SimpleNamespace(facility=facility, index=index, t=t)
+
+
+class Handler:
+    def __init__(self):
+        self.gate = threading.Event()
+        self.batches: list[tuple[list, bool]] = []
+        self.handled = threading.Condition()
+
+    def __call__(self, events: list, overflowed: bool):
+        self.gate.wait(2)
+        with self.handled:
+            self.batches.append((events, overflowed))
+            self.handled.notify_all()
+
+    def wait_for(self, count: int):
+        with self.handled:
+            assert self.handled.wait_for(lambda: len(self.batches) >= count, 2)
+
+
+def fill_while_busy(queue: PulseEventQueue, handler: Handler, events: list):
+    # The first batch holds the worker, so everything after it queues up
+    queue.put(event("client", 999))
+    while queue.get_stats()["pending"]:
+        time.sleep(0.001)
+
+    for e in events:
+        queue.put(e)
+
+    handler.gate.set()
+    handler.wait_for(2)
+
+
+def test_events_for_the_same_device_are_coalesced():
+    handler = Handler()
+    queue = PulseEventQueue(handler)
+
+    latest = event("sink", 1)
+    fill_while_busy(queue, handler, [event("sink", 1), event("source", 1), event("sink", 2), latest])
+
+    events, overflowed = handler.batches[1]
+    assert not overflowed
+    assert [(e.facility, e.index) for e in events] == [("sink", 1), ("source", 1), ("sink", 2)]
+    assert events[0] is latest
+    assert queue.get_stats()["coalesced"] == 1
+    queue.stop()
+
+
+def test_overflow_drops_events_and_requests_a_resync():
+    handler = Handler()
+    queue = PulseEventQueue(handler, max_size=2)
+
+    fill_while_busy(queue, handler, [event("sink", i) for i in range(5)])
+
+    events, overflowed = handler.batches[1]
+    assert overflowed
+    assert [e.index for e in events] == [0, 1]
+
+    stats = queue.get_stats()
+    assert stats["dropped"] == 3
+    assert stats["overflows"] == 1
+    queue.stop()